@@ -0,0 +1,16 @@
+import os
+
+from app.core.config import settings
+
+# OpenMP/MKL size their thread pools when torch and faiss are first
+# imported, so the limits must be in the environment before any model
+# module loads. ModelManager.load_models applies the same value to torch.
+# Limits the operator already exported are left alone.
+for _var in (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "VECLIB_MAXIMUM_THREADS",
+    "NUMEXPR_NUM_THREADS",
+):
+    os.environ.setdefault(_var, str(settings.torch_num_threads))
@@ -1,17 +1,19 @@
 from fastapi import APIRouter, HTTPException, Request
 from slowapi import Limiter
-from slowapi.util import get_remote_address
 import logging
 from concurrent.futures import ThreadPoolExecutor
 import asyncio
+import time
 
 from app.api.schemas import (
     ClassifyRequest,
     ClassifyResponse,
     HealthResponse
 )
-from app.services.classifier import classify_text
+from app.services.classifier import classify_text_async
 from app.core.models import ModelManager
+from app.core.config import settings
+from app.core.rate_limit import client_ip_key
 from app.core.cache import get_cached_result, cache_result, get_cache_info
 from app.core.exceptions import ClassificationException
 
@@ -20,10 +22,33 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Initialize limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=client_ip_key)
 
-# Dedicated thread pool for ML operations (prevents event loop blocking)
-ml_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml-worker")
+# Dedicated thread pools for ML operations (prevents event loop blocking).
+# Retrieval and NLI use separate workers so they can overlap across requests,
+# unless SHARE_ML_EXECUTOR is set (default on macOS, where concurrent forward
+# passes on two threads risk the segfaults single-threaded mode avoids).
+if settings.share_ml_executor:
+    embed_executor = nli_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ml-worker")
+else:
+    embed_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embed-worker")
+    nli_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nli-worker")
+
+CLASSIFY_TIMEOUT = 45.0  # seconds
+
+
+async def _await_with_timeout(coro, timeout: float):
+    """
+    Await coro, raising asyncio.TimeoutError after timeout seconds.
+
+    Uses the asyncio.timeout() context manager (Python 3.11+), which cancels
+    the current task in place instead of wrapping coro in a new task like
+    asyncio.wait_for does.
+    """
+    if hasattr(asyncio, "timeout"):
+        async with asyncio.timeout(timeout):
+            return await coro
+    return await asyncio.wait_for(coro, timeout=timeout)
 
 
 @router.post("/classify", response_model=ClassifyResponse)
@@ -42,59 +67,51 @@ async def classify_endpoint(request: Request, classify_req: ClassifyRequest):
     Returns:
         ClassifyResponse with overall classification, confidence, and claim analysis
     """
-    import sys
-
-    # Log with flush for crash debugging
-    logger.info("=" * 60)
-    logger.info(f"📝 CLASSIFY REQUEST START")
-    logger.info(f"   Text length: {len(classify_req.text)} chars")
-    logger.info(f"   Preview: {classify_req.text[:100]}...")
-    sys.stdout.flush()
+    start = time.perf_counter()
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Classify request: {len(classify_req.text)} chars, "
+            f"preview: {classify_req.text[:100]!r}"
+        )
 
     try:
         # Check cache
-        cached = get_cached_result(classify_req.text)
+        cached = await get_cached_result(classify_req.text)
         if cached:
-            logger.info("✓ Cache hit")
-            sys.stdout.flush()
+            logger.info(
+                f"Classify complete: {cached['overall_classification']} "
+                f"(cached, {(time.perf_counter() - start) * 1000:.0f}ms)"
+            )
             return cached
 
-        # Run blocking ML in separate thread to avoid blocking event loop
-        logger.info("🔍 Starting classification in worker thread...")
-        sys.stdout.flush()
-
-        loop = asyncio.get_event_loop()
+        # NLI pairs are batched with concurrent requests when the batcher is running
+        nli_batcher = getattr(request.app.state, "nli_batcher", None)
 
         # Add timeout protection
         try:
-            result = await asyncio.wait_for(
-                loop.run_in_executor(ml_executor, classify_text, classify_req.text),
-                timeout=45.0  # 45 second timeout
+            result = await _await_with_timeout(
+                classify_text_async(classify_req.text, embed_executor, nli_executor, nli_batcher),
+                CLASSIFY_TIMEOUT
             )
         except asyncio.TimeoutError:
-            logger.error("❌ Classification timed out after 45 seconds")
-            sys.stdout.flush()
+            logger.error(f"Classification timed out after {CLASSIFY_TIMEOUT:.0f} seconds")
             raise ClassificationException(
                 "Classification timed out. The text might be too complex or the server is overloaded.",
-                details={"timeout": 45, "text_length": len(classify_req.text)}
+                details={"timeout": CLASSIFY_TIMEOUT, "text_length": len(classify_req.text)}
             )
 
-        logger.info(f"✓ Classification complete: {result['overall_classification']}")
-        sys.stdout.flush()
-
         # Cache result
-        cache_result(classify_req.text, result)
-
-        logger.info("✅ REQUEST COMPLETE")
-        logger.info("=" * 60)
-        sys.stdout.flush()
+        await cache_result(classify_req.text, result)
 
+        logger.info(
+            f"Classify complete: {result['overall_classification']} "
+            f"(confidence={result['confidence']:.2f}, claims={len(result['claims'])}, "
+            f"chars={len(classify_req.text)}, {(time.perf_counter() - start) * 1000:.0f}ms)"
+        )
         return result
 
     except Exception as e:
-        logger.error(f"❌ CLASSIFICATION FAILED: {str(e)}", exc_info=True)
-        sys.stdout.flush()
-        sys.stderr.flush()
+        logger.error(f"Classification failed: {str(e)}", exc_info=True)
         raise ClassificationException(
             f"Failed to classify text: {str(e)}",
             details={"error_type": type(e).__name__}
@@ -136,7 +153,7 @@ async def health_check():
 @router.get("/cache-info")
 async def cache_info_endpoint():
     """Get cache statistics (for debugging)."""
-    return get_cache_info()
+    return await get_cache_info()
 
 
 @router.get("/topics")
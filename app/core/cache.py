@@ -1,37 +1,107 @@
 """
-Response caching system using TTL cache.
+Response caching system with in-memory or Redis backend.
 
 Caches classification results to avoid duplicate processing of the same text.
-Uses MD5 hashing for cache keys and TTL (time-to-live) for automatic expiration.
+Uses xxHash (XXH3, non-cryptographic) for cache keys and TTL (time-to-live)
+for automatic expiration.
+
+The default "memory" backend is a per-process TTLCache. With several Uvicorn
+workers each one has its own cache, so set CACHE_BACKEND=redis (and
+REDIS_URL) to share cached results across workers.
 """
-import hashlib
+import json
 import logging
 from typing import Optional, Dict, Any
 from cachetools import TTLCache
+import xxhash
+
+from app.core.config import settings
+from app.core.exceptions import CacheException
 
 logger = logging.getLogger(__name__)
 
-# Cache configuration: 100 entries with 5-minute TTL
-response_cache = TTLCache(maxsize=100, ttl=300)
+# In-memory backend: 100 entries with 5-minute TTL
+response_cache = TTLCache(maxsize=100, ttl=settings.cache_ttl)
+
+# Bump when the key derivation or cached result format changes
+CACHE_KEY_VERSION = "v2"
+
+# Namespace for keys in a shared Redis database
+REDIS_KEY_PREFIX = "classify:"
+
+_redis = None
 
 
 def get_cache_key(text: str) -> str:
     """
-    Generate a cache key from input text using MD5 hash.
+    Generate a cache key from input text using XXH3-64 hash.
 
     Args:
         text: Input text to hash
 
     Returns:
-        MD5 hash of the text as hex string
+        Versioned key: "<CACHE_KEY_VERSION>:<xxh3 hex digest>"
+    """
+    return f"{CACHE_KEY_VERSION}:{xxhash.xxh3_64_hexdigest(text.encode('utf-8'))}"
+
+
+def _use_redis() -> bool:
+    return settings.cache_backend == "redis"
+
+
+def _get_redis():
+    """
+    Get the shared Redis client, creating it on first use.
+
+    Raises:
+        CacheException: If the redis package is not installed
+    """
+    global _redis
+    if _redis is None:
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise CacheException(
+                "Redis cache backend requires the 'redis' package. "
+                "Install it or set CACHE_BACKEND=memory.",
+                details={"backend": "redis", "error": str(e)}
+            )
+        _redis = redis.from_url(settings.redis_url)
+    return _redis
+
+
+async def init_cache() -> None:
     """
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+    Connect the configured cache backend at startup.
 
+    For the Redis backend this creates the client and pings the server,
+    so a missing package or unreachable REDIS_URL fails at boot rather
+    than on every request.
 
-def get_cached_result(text: str) -> Optional[Dict[str, Any]]:
+    Raises:
+        CacheException: If the Redis backend can't be used
+    """
+    if not _use_redis():
+        return
+
+    redis = _get_redis()
+    try:
+        await redis.ping()
+    except Exception as e:
+        raise CacheException(
+            f"Could not connect to Redis at {settings.redis_url}: {str(e)}",
+            details={"backend": "redis", "error": str(e)}
+        )
+    logger.info("Response cache: Redis")
+
+
+async def get_cached_result(text: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve cached classification result for the given text.
 
+    Redis errors (including undecodable values) are logged and treated as
+    a cache miss.
+
     Args:
         text: Input text to look up
 
@@ -39,41 +109,89 @@ def get_cached_result(text: str) -> Optional[Dict[str, Any]]:
         Cached result dictionary if found, None otherwise
     """
     key = get_cache_key(text)
-    result = response_cache.get(key)
 
-    if result is not None:
-        logger.info(f"Cache hit for key: {key[:8]}...")
+    if _use_redis():
+        try:
+            raw = await _get_redis().get(REDIS_KEY_PREFIX + key)
+            result = json.loads(raw) if raw is not None else None
+        except Exception as e:
+            logger.warning(f"Redis cache lookup failed: {str(e)}")
+            return None
+    else:
+        result = response_cache.get(key)
+
+    if result is not None and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Cache hit for key: {key[:11]}...")
 
     return result
 
 
-def cache_result(text: str, result: Dict[str, Any]) -> None:
+async def cache_result(text: str, result: Dict[str, Any]) -> None:
     """
     Cache a classification result for the given text.
 
+    Redis errors are logged and the result is not cached.
+
     Args:
         text: Input text that was classified
         result: Classification result to cache
     """
     key = get_cache_key(text)
-    response_cache[key] = result
-    logger.debug(f"Cached result for key: {key[:8]}...")
+
+    if _use_redis():
+        try:
+            await _get_redis().set(
+                REDIS_KEY_PREFIX + key,
+                json.dumps(result, ensure_ascii=False),
+                ex=settings.cache_ttl
+            )
+        except Exception as e:
+            logger.warning(f"Redis cache write failed: {str(e)}")
+            return
+    else:
+        response_cache[key] = result
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Cached result for key: {key[:11]}...")
 
 
-def clear_cache() -> None:
+async def clear_cache() -> None:
     """Clear all cached results."""
-    response_cache.clear()
+    if _use_redis():
+        redis = _get_redis()
+        keys = [key async for key in redis.scan_iter(match=REDIS_KEY_PREFIX + "*")]
+        if keys:
+            await redis.delete(*keys)
+    else:
+        response_cache.clear()
     logger.info("Cache cleared")
 
 
-def get_cache_info() -> Dict[str, Any]:
+async def close_cache() -> None:
+    """Close the Redis connection pool, if one was opened."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def get_cache_info() -> Dict[str, Any]:
     """
     Get information about the current cache state.
 
     Returns:
         Dictionary with cache statistics
     """
+    if _use_redis():
+        # Counting keys would scan the whole shared keyspace; size is unknown
+        return {
+            "backend": "redis",
+            "size": None,
+            "ttl": settings.cache_ttl
+        }
+
     return {
+        "backend": "memory",
         "size": len(response_cache),
         "maxsize": response_cache.maxsize,
         "ttl": response_cache.ttl,
@@ -1,8 +1,18 @@
 import os
+import sys
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
 
+def _omp_num_threads(default: int = 1) -> int:
+    """Thread count from an operator-set OMP_NUM_THREADS (e.g. "4" or "4,2"), if any."""
+    try:
+        return int(os.environ.get("OMP_NUM_THREADS", "").split(",")[0])
+    except ValueError:
+        return default
+
+
 class Settings(BaseSettings):
     # API Configuration
     api_host: str = "0.0.0.0"
@@ -11,8 +21,16 @@ class Settings(BaseSettings):
 
     # Model Configuration
     embedding_model: str = "all-MiniLM-L6-v2"
+    embedding_quantize: bool = False  # dynamic INT8 quantization of the embedding model (CPU)
     nli_model: str = "roberta-large-mnli"
     device: str = "cpu"  # or "cuda" for GPU
+    # intra-op threads (defaults to OMP_NUM_THREADS, else 1); 1 avoids crashes on macOS, raise on Linux servers
+    torch_num_threads: int = Field(default_factory=_omp_num_threads)
+    # Run embedding and NLI on one worker thread (no concurrent forward passes); default on macOS
+    share_ml_executor: bool = sys.platform == "darwin"
+    nli_backend: str = "torch"  # "torch" (PyTorch) or "onnx" (ONNX Runtime via optimum)
+    nli_onnx_quantize: bool = True  # dynamic INT8 quantization of the ONNX graph (CPU only)
+    nli_compile: bool = False  # torch.compile the NLI model at startup (torch backend only)
 
     # Classification Thresholds
     truth_threshold: float = 0.75  # support >= 0.75 -> "правда" (lowered from 0.85)
@@ -22,23 +40,45 @@ class Settings(BaseSettings):
     top_k_proofs: int = 10  # increased from 6 for better evidence quality
     max_claims: int = 8
 
+    # FAISS Index
+    faiss_index_type: str = "flat"  # "flat" (exact) or "hnsw" (approximate; only pays off above a few thousand snippets)
+    faiss_hnsw_m: int = 32  # HNSW graph neighbors per node
+    faiss_hnsw_ef_construction: int = 200  # build-time search depth
+    faiss_hnsw_ef_search: int = 64  # query-time search depth (raised to top_k * 4 if needed)
+    faiss_use_gpu: bool = False  # move the index to GPU 0 (needs faiss-gpu, flat index)
+
     # Aggregation Strategy
     use_weighted_aggregation: bool = True  # weighted voting vs pessimistic aggregation
     neutral_vote_weight: float = 0.5  # weight multiplier for neutral claims (0.0-1.0)
 
     # NLI Configuration
     use_nli_context: bool = True  # add "Established fact:" prefix to guide NLI model
+    nli_max_length: int = 256  # max tokens per (premise, hypothesis) pair
+    nli_max_premise_chars: int = 2000  # snippets are cut to this before tokenizing
+    nli_max_hypothesis_chars: int = 500  # claims (with prefix) are cut to this before tokenizing
+    nli_batch_size: int = 16  # pairs per forward pass (pairs are length-sorted first)
+    nli_batch_wait_ms: float = 5.0  # how long to gather pairs from concurrent requests
+    nli_max_batch_pairs: int = 128  # max pairs merged across requests per NLI call
+    nli_cache_size: int = 4096  # cached (snippet, claim) NLI scores, 0 disables
+    nli_gate_threshold: float = 0.35  # proofs below this retrieval score skip NLI (top-1 always scored)
 
     # Paths
     project_root: Path = Path(__file__).parent.parent.parent
     models_cache_dir: Path = project_root / "models"
+    nli_onnx_dir: Path = models_cache_dir / "nli-onnx"
     data_dir: Path = project_root / "data"
     faiss_index_path: Path = data_dir / "faiss_index" / "wikipedia.index"
     kb_snippets_path: Path = data_dir / "kb_snippets.json"
+    kb_metadata_path: Path = data_dir / "kb_snippets.parquet"  # preferred over kb_snippets_path
 
     # Wikipedia KB
     max_sentences_per_page: int = 15
 
+    # Response Cache
+    cache_backend: str = "memory"  # "memory" (per process) or "redis" (shared across workers)
+    cache_ttl: int = 300  # seconds
+    redis_url: str = "redis://localhost:6379/0"
+
     # Rate Limiting
     rate_limit_enabled: bool = True
     rate_limit_requests: int = 10  # requests per minute
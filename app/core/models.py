@@ -1,10 +1,12 @@
 import json
 import logging
-import os
-from typing import List, Dict, Optional
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Dict, Optional
 from sentence_transformers import SentenceTransformer
-from transformers import pipeline
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
 import faiss
+import pyarrow.parquet as pq
 import torch
 
 from app.core.config import settings
@@ -13,6 +15,55 @@ from app.core.exceptions import ModelNotLoadedException, KnowledgeBaseException
 logger = logging.getLogger(__name__)
 
 
+def load_embedding_model() -> SentenceTransformer:
+    """
+    Load the sentence embedding model used for the KB and claim queries.
+
+    With settings.embedding_quantize the Linear layers are dynamically
+    quantized to INT8. The KB build uses this same loader, so rebuild the
+    KB after toggling the flag to keep index and query vectors consistent.
+    """
+    model = SentenceTransformer(settings.embedding_model, device='cpu')
+    if settings.embedding_quantize:
+        model = torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+class KBSnippets(Sequence):
+    """
+    Read-only list view over the KB metadata columns.
+
+    Holds the snippet and source columns of the Parquet KB metadata as
+    Arrow arrays and builds {"snippet", "source"} dicts only for the rows
+    that are actually accessed, instead of materializing a Python dict per
+    row at startup. The columns themselves are decoded into memory on load
+    (Parquet pages are compressed/encoded, so they can't be mmapped views).
+    """
+
+    def __init__(self, snippets, sources):
+        self._snippets = snippets
+        self._sources = sources
+
+    @classmethod
+    def from_parquet(cls, path: Path) -> 'KBSnippets':
+        """Read the snippet/source columns of a Parquet file into Arrow arrays."""
+        table = pq.read_table(path, columns=["snippet", "source"], memory_map=True)
+        return cls(table.column("snippet"), table.column("source"))
+
+    def __len__(self) -> int:
+        return len(self._snippets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return {
+            "snippet": self._snippets[i].as_py(),
+            "source": self._sources[i].as_py()
+        }
+
+
 class ModelManager:
     """
     Singleton class for managing ML models and FAISS index.
@@ -20,9 +71,11 @@ class ModelManager:
     """
     _instance: Optional['ModelManager'] = None
     _embed_model: Optional[SentenceTransformer] = None
-    _nli_pipeline = None
+    _nli_model = None
+    _nli_tokenizer = None
     _faiss_index: Optional[faiss.Index] = None
-    _kb_snippets: Optional[List[Dict[str, str]]] = None
+    _faiss_gpu_resources = None
+    _kb_snippets: Optional[Sequence[Dict[str, str]]] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -44,29 +97,23 @@ class ModelManager:
 
         logger.info("Loading models...")
 
-        # CRITICAL: Single-threaded mode to prevent threading crashes on macOS
-        torch.set_num_threads(1)  # Only 1 thread!
+        # CRITICAL: Single-threaded mode (default) prevents threading crashes on macOS.
+        # OMP/MKL env limits are set in app/__init__.py, before torch is imported.
+        torch.set_num_threads(settings.torch_num_threads)
         torch.set_num_interop_threads(1)
-        os.environ["OMP_NUM_THREADS"] = "1"
-        os.environ["MKL_NUM_THREADS"] = "1"
-        os.environ["OPENBLAS_NUM_THREADS"] = "1"
-        os.environ["VECLIB_MAXIMUM_THREADS"] = "1"
-        os.environ["NUMEXPR_NUM_THREADS"] = "1"
-        logger.info("PyTorch threads limited to 1 (single-threaded mode for stability)")
+        logger.info(f"PyTorch intra-op threads: {settings.torch_num_threads}, inter-op threads: 1")
 
         try:
             # Load embedding model
-            logger.info(f"Loading embedding model: {settings.embedding_model} (device=cpu)")
-            self._embed_model = SentenceTransformer(settings.embedding_model, device='cpu')
-
-            # Load NLI pipeline
-            logger.info(f"Loading NLI model: {settings.nli_model}")
-            device = -1 if settings.device == "cpu" else 0
-            self._nli_pipeline = pipeline(
-                "text-classification",
-                model=settings.nli_model,
-                device=device
+            logger.info(
+                f"Loading embedding model: {settings.embedding_model} "
+                f"(device=cpu, int8={settings.embedding_quantize})"
             )
+            self._embed_model = load_embedding_model()
+
+            # Load NLI model and tokenizer
+            logger.info(f"Loading NLI model: {settings.nli_model} (backend={settings.nli_backend})")
+            self._nli_model, self._nli_tokenizer = self._load_nli_model()
 
             # Load FAISS index
             logger.info(f"Loading FAISS index from: {settings.faiss_index_path}")
@@ -76,18 +123,14 @@ class ModelManager:
                     f"Please run 'python scripts/build_kb.py' first.",
                     details={"path": str(settings.faiss_index_path)}
                 )
-            self._faiss_index = faiss.read_index(str(settings.faiss_index_path))
+            self._faiss_index = self._read_index(settings.faiss_index_path)
+            if isinstance(self._faiss_index, faiss.IndexHNSW):
+                self._faiss_index.hnsw.efSearch = settings.faiss_hnsw_ef_search
+            if settings.faiss_use_gpu:
+                self._faiss_index = self._index_to_gpu(self._faiss_index)
 
             # Load KB snippets metadata
-            logger.info(f"Loading KB snippets from: {settings.kb_snippets_path}")
-            if not settings.kb_snippets_path.exists():
-                raise KnowledgeBaseException(
-                    f"KB snippets not found at {settings.kb_snippets_path}. "
-                    f"Please run 'python scripts/build_kb.py' first.",
-                    details={"path": str(settings.kb_snippets_path)}
-                )
-            with open(settings.kb_snippets_path, "r", encoding="utf-8") as f:
-                self._kb_snippets = json.load(f)
+            self._kb_snippets = self._load_snippets()
 
             logger.info(f"Models loaded successfully. KB size: {len(self._kb_snippets)} snippets")
 
@@ -100,6 +143,203 @@ class ModelManager:
                 details={"error": str(e), "error_type": type(e).__name__}
             )
 
+    def _load_nli_model(self):
+        """
+        Load the NLI sequence classification model for the configured backend.
+
+        Returns:
+            Tuple of (model, tokenizer)
+        """
+        if settings.nli_backend == "onnx":
+            return self._load_onnx_nli()
+
+        tokenizer = AutoTokenizer.from_pretrained(settings.nli_model)
+        model = AutoModelForSequenceClassification.from_pretrained(settings.nli_model)
+        model.to(settings.device)
+        model.eval()
+
+        if settings.nli_compile:
+            model = self._compile_nli(model, tokenizer)
+        return model, tokenizer
+
+    def _compile_nli(self, model, tokenizer):
+        """
+        Compile the NLI model with torch.compile and warm it up.
+
+        Compilation happens lazily on the first call, so dummy batches are run
+        here to pay that cost at startup. torch.compile specializes on
+        dimensions of size 1, so it is warmed up twice: with a single pair
+        (nli_score, one uncached pair, a trailing length bucket) and with
+        nli_batch_size pairs (at least 2) of different lengths. If compilation
+        fails the eager model is returned instead.
+        """
+        mode = "default" if settings.device == "cpu" else "reduce-overhead"
+        logger.info(f"Compiling NLI model with torch.compile (mode={mode})")
+        compiled = torch.compile(model, mode=mode, dynamic=True)
+
+        batch_size = max(settings.nli_batch_size, 2)
+        premises = [
+            "The sky is blue." if i % 2 == 0 else
+            "The sky is blue on a clear day because air scatters blue light more than red light."
+            for i in range(batch_size)
+        ]
+        try:
+            for batch in (premises[:1], premises):
+                enc = tokenizer(
+                    batch,
+                    ["The sky has a color."] * len(batch),
+                    padding=True,
+                    truncation=True,
+                    max_length=settings.nli_max_length,
+                    return_tensors="pt"
+                ).to(model.device)
+                with torch.inference_mode():
+                    compiled(**enc)
+        except Exception as e:
+            logger.warning(f"torch.compile failed, using eager NLI model: {str(e)}")
+            return model
+
+        return compiled
+
+    def _load_onnx_nli(self):
+        """
+        Load the NLI model as an optimized ONNX Runtime graph.
+
+        The model is exported once to a per-model subdirectory of
+        settings.nli_onnx_dir (see _onnx_cache_dir), graph-optimized
+        (attention/LayerNorm/GELU fusion) and, on CPU, dynamically quantized
+        to INT8. Subsequent startups load the cached graph directly.
+
+        Returns:
+            Tuple of (ORTModelForSequenceClassification, tokenizer)
+
+        Raises:
+            ModelNotLoadedException: If optimum[onnxruntime] is not installed
+        """
+        try:
+            from optimum.onnxruntime import (
+                ORTModelForSequenceClassification,
+                ORTOptimizer,
+                ORTQuantizer,
+            )
+            from optimum.onnxruntime.configuration import (
+                AutoOptimizationConfig,
+                AutoQuantizationConfig,
+            )
+        except ImportError as e:
+            raise ModelNotLoadedException(
+                "ONNX backend requires 'optimum[onnxruntime]'. "
+                "Install it or set NLI_BACKEND=torch.",
+                details={"backend": "onnx", "error": str(e)}
+            )
+
+        onnx_dir = self._onnx_cache_dir()
+        use_gpu = settings.device != "cpu"
+        quantize = settings.nli_onnx_quantize and not use_gpu
+        file_name = "model_optimized_quantized.onnx" if quantize else "model_optimized.onnx"
+
+        if not (onnx_dir / file_name).exists():
+            logger.info(f"Exporting {settings.nli_model} to ONNX: {onnx_dir}")
+            model = ORTModelForSequenceClassification.from_pretrained(settings.nli_model, export=True)
+            tokenizer = AutoTokenizer.from_pretrained(settings.nli_model)
+            model.save_pretrained(onnx_dir)
+            tokenizer.save_pretrained(onnx_dir)
+
+            optimizer = ORTOptimizer.from_pretrained(model)
+            optimizer.optimize(
+                save_dir=onnx_dir,
+                optimization_config=AutoOptimizationConfig.O2()
+            )
+
+            if quantize:
+                quantizer = ORTQuantizer.from_pretrained(onnx_dir, file_name="model_optimized.onnx")
+                quantizer.quantize(
+                    save_dir=onnx_dir,
+                    quantization_config=AutoQuantizationConfig.avx512_vnni(
+                        is_static=False, per_channel=False
+                    )
+                )
+
+        provider = "CUDAExecutionProvider" if use_gpu else "CPUExecutionProvider"
+        logger.info(f"Loading ONNX NLI graph: {file_name} ({provider})")
+        model = ORTModelForSequenceClassification.from_pretrained(
+            onnx_dir,
+            file_name=file_name,
+            provider=provider
+        )
+        tokenizer = AutoTokenizer.from_pretrained(onnx_dir)
+        return model, tokenizer
+
+    def _read_index(self, path: Path) -> faiss.Index:
+        """
+        Read the FAISS index with the mmap and read-only IO flags.
+
+        faiss only honours mmap for IVF inverted lists, which then stay on
+        disk and are paged in on demand. Flat and HNSW indexes are still read
+        fully into memory. Falls back to a plain read if this faiss build
+        rejects the flags.
+        """
+        flags = getattr(faiss, "IO_FLAG_MMAP", 0) | getattr(faiss, "IO_FLAG_READ_ONLY", 0)
+        try:
+            return faiss.read_index(str(path), flags)
+        except Exception as e:
+            logger.warning(f"Memory-mapped FAISS read failed, reading normally: {str(e)}")
+            return faiss.read_index(str(path))
+
+    def _load_snippets(self) -> Sequence[Dict[str, str]]:
+        """
+        Load KB snippets metadata.
+
+        Prefers the columnar Parquet file (settings.kb_metadata_path); falls
+        back to the JSON file written by older KB builds.
+        """
+        if settings.kb_metadata_path.exists():
+            logger.info(f"Loading KB snippets from: {settings.kb_metadata_path}")
+            return KBSnippets.from_parquet(settings.kb_metadata_path)
+
+        logger.info(f"Loading KB snippets from: {settings.kb_snippets_path}")
+        if not settings.kb_snippets_path.exists():
+            raise KnowledgeBaseException(
+                f"KB snippets not found at {settings.kb_metadata_path} or {settings.kb_snippets_path}. "
+                f"Please run 'python scripts/build_kb.py' first.",
+                details={"path": str(settings.kb_metadata_path)}
+            )
+        with open(settings.kb_snippets_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _onnx_cache_dir(self) -> Path:
+        """
+        Directory of the exported ONNX graph for settings.nli_model.
+
+        Keyed by model name (e.g. "org/model" -> "org--model") so changing
+        NLI_MODEL exports a new graph instead of reusing the old model's.
+        """
+        return settings.nli_onnx_dir / settings.nli_model.replace("/", "--")
+
+    def _index_to_gpu(self, index: faiss.Index) -> faiss.Index:
+        """
+        Copy the FAISS index to GPU 0.
+
+        Falls back to the CPU index (with a warning) when faiss was built
+        without GPU support, no GPU is visible, or the index type has no GPU
+        implementation (e.g. HNSW; use FAISS_INDEX_TYPE=flat).
+        """
+        if not hasattr(faiss, "StandardGpuResources") or faiss.get_num_gpus() == 0:
+            logger.warning("FAISS_USE_GPU is set but no FAISS GPU support found, using CPU index")
+            return index
+
+        try:
+            resources = faiss.StandardGpuResources()
+            gpu_index = faiss.index_cpu_to_gpu(resources, 0, index)
+        except Exception as e:
+            logger.warning(f"Could not move FAISS index to GPU, using CPU index: {str(e)}")
+            return index
+
+        # GPU resources must outlive the index
+        self._faiss_gpu_resources = resources
+        logger.info("FAISS index moved to GPU 0")
+        return gpu_index
+
     def get_embed_model(self) -> SentenceTransformer:
         """Get the embedding model."""
         if self._embed_model is None:
@@ -110,13 +350,22 @@ class ModelManager:
         return self._embed_model
 
     def get_nli(self):
-        """Get the NLI pipeline."""
-        if self._nli_pipeline is None:
+        """Get the NLI sequence classification model."""
+        if self._nli_model is None:
             raise ModelNotLoadedException(
                 "NLI model not loaded. Please wait for models to initialize.",
                 details={"model": settings.nli_model}
             )
-        return self._nli_pipeline
+        return self._nli_model
+
+    def get_nli_tokenizer(self):
+        """Get the NLI tokenizer."""
+        if self._nli_tokenizer is None:
+            raise ModelNotLoadedException(
+                "NLI tokenizer not loaded. Please wait for models to initialize.",
+                details={"model": settings.nli_model}
+            )
+        return self._nli_tokenizer
 
     def get_index(self) -> faiss.Index:
         """Get the FAISS index."""
@@ -127,7 +376,7 @@ class ModelManager:
             )
         return self._faiss_index
 
-    def get_snippets(self) -> List[Dict[str, str]]:
+    def get_snippets(self) -> Sequence[Dict[str, str]]:
         """Get the KB snippets metadata."""
         if self._kb_snippets is None:
             raise ModelNotLoadedException(
@@ -0,0 +1,26 @@
+"""
+Rate limiting helpers.
+
+Key function for the slowapi Limiter instances in app/main.py and
+app/api/routes.py.
+"""
+from starlette.requests import Request
+
+
+def client_ip_key(request: Request) -> str:
+    """
+    Rate-limit key: the client IP from the ASGI scope.
+
+    Same result as slowapi.util.get_remote_address, but reads the
+    (host, port) tuple from request.scope directly instead of building a
+    starlette Address through request.client.
+
+    Args:
+        request: Incoming request
+
+    Returns:
+        Client IP, or "127.0.0.1" when the server provides no (or an empty)
+        client address
+    """
+    client = request.scope.get("client")
+    return (client[0] if client else None) or "127.0.0.1"
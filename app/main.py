@@ -2,13 +2,15 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
 from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 from pathlib import Path
 import logging
 
-from app.api.routes import router
+from app.api.routes import router, nli_executor
 from app.core.models import ModelManager
+from app.core.cache import init_cache, close_cache
+from app.core.rate_limit import client_ip_key
+from app.services.nli_batcher import NLIBatcher
 from app.core.exceptions import (
     AppBaseException,
     ModelNotLoadedException,
@@ -31,7 +33,7 @@ app = FastAPI(
 )
 
 # Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(key_func=client_ip_key)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -87,6 +89,12 @@ async def startup_event():
         mm = ModelManager.get_instance()
         mm.load_models()
         logger.info("✓ Models loaded successfully")
+
+        await init_cache()
+
+        # Single NLI worker loop shared by all requests (cross-request batching)
+        app.state.nli_batcher = NLIBatcher(nli_executor)
+        app.state.nli_batcher.start()
         logger.info("=" * 60)
         logger.info("  📡 API Documentation: http://localhost:8000/docs")
         logger.info("  🌐 Web Interface:     http://localhost:8000")
@@ -101,6 +109,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on application shutdown."""
     logger.info("Shutting down application...")
+    nli_batcher = getattr(app.state, "nli_batcher", None)
+    if nli_batcher is not None:
+        await nli_batcher.stop()
+    await close_cache()
 
 
 # Include API routes
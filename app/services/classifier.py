@@ -1,48 +1,39 @@
-from typing import Dict, List, Optional
+from concurrent.futures import Executor
+from functools import partial
+from typing import Dict, List, Optional, Tuple
+import asyncio
 import logging
 
 from app.services.claim_extractor import extract_claims
-from app.services.evidence_retriever import retrieve_proofs
-from app.services.nli_verifier import nli_score
+from app.services.evidence_retriever import retrieve_proofs_batch
+from app.services.nli_verifier import nli_score_batch
 from app.core.config import settings
 from app.core.exceptions import ClassificationException
 
 logger = logging.getLogger(__name__)
 
 
-def assess_claim(claim: str, top_k: int = None) -> Dict:
+def _summarize_claim(claim: str, proofs: List[Dict]) -> Dict:
     """
-    Assess a single claim by retrieving evidence and computing NLI scores.
+    Build the claim assessment from proofs that already carry an nli_score.
 
     Args:
-        claim: The claim text to assess
-        top_k: Number of evidence snippets to retrieve
+        claim: The claim text
+        proofs: Retrieved proofs with "nli_score" set
 
     Returns:
         Dict with keys: claim, support, best_proof, all_proofs
     """
-    if top_k is None:
-        top_k = settings.top_k_proofs
-
-    # Retrieve evidence
-    proofs = retrieve_proofs(claim, top_k=top_k)
-
-    # Calculate NLI scores for each proof
-    scores = []
     best_proof = None
     best_score = -1.0
 
     for proof in proofs:
-        nli_ent_score = nli_score(claim, proof["snippet"])
-        proof["nli_score"] = nli_ent_score
-        scores.append(nli_ent_score)
-
-        if nli_ent_score > best_score:
-            best_score = nli_ent_score
+        if proof["nli_score"] > best_score:
+            best_score = proof["nli_score"]
             best_proof = proof
 
     # Aggregate: use max entailment as support score
-    support = max(scores) if scores else 0.0
+    support = best_score if best_proof else 0.0
 
     return {
         "claim": claim,
@@ -52,6 +43,141 @@ def assess_claim(claim: str, top_k: int = None) -> Dict:
     }
 
 
+def retrieve_evidence(claims: List[str], top_k: int = None) -> List[List[Dict]]:
+    """
+    Retrieve evidence snippets for each claim in one batched encode + search.
+
+    Args:
+        claims: The claim texts
+        top_k: Number of evidence snippets to retrieve per claim
+
+    Returns:
+        List of proof lists, one per claim (same order)
+    """
+    if top_k is None:
+        top_k = settings.top_k_proofs
+
+    return retrieve_proofs_batch(claims, top_k=top_k)
+
+
+def gate_proofs(proofs: List[Dict]) -> List[Dict]:
+    """
+    Select the proofs worth sending to the NLI model.
+
+    Proofs with retrieval_score below settings.nli_gate_threshold are
+    unlikely to entail the claim, so they skip NLI and score 0.0. The
+    proof with the highest retrieval_score is always kept so every claim
+    gets at least one NLI judgement.
+
+    Args:
+        proofs: Retrieved proofs for one claim
+
+    Returns:
+        The subset of proofs to score, in their original order
+    """
+    if not proofs:
+        return []
+
+    top_proof = max(proofs, key=lambda proof: proof["retrieval_score"])
+    return [
+        proof for proof in proofs
+        if proof is top_proof or proof["retrieval_score"] >= settings.nli_gate_threshold
+    ]
+
+
+def build_nli_pairs(
+    claims: List[str],
+    proofs_per_claim: List[List[Dict]]
+) -> Tuple[List[Tuple[str, str]], List[Tuple[int, int]]]:
+    """
+    Flatten claims and their gated proofs into (claim, snippet) pairs for NLI scoring.
+
+    Pairs are grouped by claim, in proof order. Proofs dropped by
+    gate_proofs are not included.
+
+    Returns:
+        Tuple of (pairs, indices) where indices[i] is the
+        (claim_idx, proof_idx) that pairs[i] was built from
+    """
+    pairs = []
+    indices = []
+    for claim_idx, (claim, proofs) in enumerate(zip(claims, proofs_per_claim)):
+        gated = {id(proof) for proof in gate_proofs(proofs)}
+        for proof_idx, proof in enumerate(proofs):
+            if id(proof) in gated:
+                pairs.append((claim, proof["snippet"]))
+                indices.append((claim_idx, proof_idx))
+    return pairs, indices
+
+
+def apply_nli_scores(
+    claims: List[str],
+    proofs_per_claim: List[List[Dict]],
+    indices: List[Tuple[int, int]],
+    scores: List[float]
+) -> List[Dict]:
+    """
+    Attach NLI scores to the proofs they were computed for and assess each claim.
+
+    Args:
+        claims: The claim texts
+        proofs_per_claim: Retrieved proofs, one list per claim
+        indices: (claim_idx, proof_idx) per score, as returned by build_nli_pairs
+        scores: NLI scores in build_nli_pairs order
+
+    Proofs that gate_proofs skipped get an nli_score of 0.0.
+
+    Returns:
+        List of dicts (one per claim, same order) with keys:
+        claim, support, best_proof, all_proofs
+    """
+    if len(scores) != len(indices):
+        raise ValueError(f"Expected {len(indices)} NLI scores, got {len(scores)}")
+
+    for proofs in proofs_per_claim:
+        for proof in proofs:
+            proof["nli_score"] = 0.0
+    for (claim_idx, proof_idx), score in zip(indices, scores):
+        proofs_per_claim[claim_idx][proof_idx]["nli_score"] = score
+
+    return [
+        _summarize_claim(claim, proofs)
+        for claim, proofs in zip(claims, proofs_per_claim)
+    ]
+
+
+def assess_claims(claims: List[str], top_k: int = None) -> List[Dict]:
+    """
+    Assess several claims, scoring all claim-evidence pairs in one NLI batch.
+
+    Args:
+        claims: The claim texts to assess
+        top_k: Number of evidence snippets to retrieve per claim
+
+    Returns:
+        List of dicts (one per claim, same order) with keys:
+        claim, support, best_proof, all_proofs
+    """
+    proofs_per_claim = retrieve_evidence(claims, top_k=top_k)
+    pairs, indices = build_nli_pairs(claims, proofs_per_claim)
+    scores = nli_score_batch(pairs)
+    return apply_nli_scores(claims, proofs_per_claim, indices, scores)
+
+
+def assess_claim(claim: str, top_k: int = None) -> Dict:
+    """
+    Assess a single claim by retrieving evidence and computing NLI scores.
+
+    Args:
+        claim: The claim text to assess
+        top_k: Number of evidence snippets to retrieve
+
+    Returns:
+        Dict with keys: claim, support, best_proof, all_proofs
+    """
+    return assess_claims([claim], top_k=top_k)[0]
+
+
 def aggregate_classifications_weighted(claim_results: List[Dict]) -> tuple[str, float]:
     """
     Aggregate claim classifications using confidence-weighted voting.
@@ -111,6 +237,109 @@ def aggregate_classifications_weighted(claim_results: List[Dict]) -> tuple[str,
     return overall, overall_confidence
 
 
+def extract_text_claims(text: str) -> List[str]:
+    """
+    Extract claims from text, limited to settings.max_claims.
+
+    Args:
+        text: Input text
+
+    Returns:
+        List of claim strings
+    """
+    claims = extract_claims(text)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"STEP 1: Extracted {len(claims)} claims")
+
+    # Limit claims if needed
+    if len(claims) > settings.max_claims:
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"STEP 2: Limiting to {settings.max_claims} claims")
+        claims = claims[:settings.max_claims]
+
+    return claims
+
+
+def build_classification(claims: List[str], assessments: List[Dict]) -> Dict:
+    """
+    Map claim assessments to classifications and aggregate the overall verdict.
+
+    Args:
+        claims: The claim texts
+        assessments: assess_claims-style results, one per claim
+
+    Returns:
+        Dict with keys: overall_classification, confidence, claims
+    """
+    claim_results = []
+    for i, (claim_text, result) in enumerate(zip(claims, assessments), 1):
+        # Map support score to classification
+        support = result["support"]
+        if support >= settings.truth_threshold:
+            classification = "правда"
+            confidence = support
+        elif support < settings.falsehood_threshold:
+            classification = "неправда"
+            confidence = 1.0 - support
+        else:
+            classification = "нейтрально"
+            confidence = support
+
+        claim_results.append({
+            "claim": claim_text,
+            "classification": classification,
+            "confidence": confidence,
+            "best_evidence": {
+                "snippet": result["best_proof"]["snippet"],
+                "source": result["best_proof"]["source"],
+                "nli_score": result["best_proof"]["nli_score"],
+                "retrieval_score": result["best_proof"]["retrieval_score"]
+            } if result["best_proof"] else None
+        })
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"STEP 3.{i}: {classification} (support: {support:.2f})")
+
+    # Use weighted confidence aggregation (new) or pessimistic aggregation (legacy)
+    if settings.use_weighted_aggregation:
+        overall, overall_confidence = aggregate_classifications_weighted(claim_results)
+    else:
+        # Legacy pessimistic aggregation
+        # Priority: if any "неправда" -> overall "неправда"
+        #           elif any "нейтрально" -> overall "нейтрально"
+        #           else -> overall "правда"
+        classifications = [r["classification"] for r in claim_results]
+        confidences = [r["confidence"] for r in claim_results]
+
+        if "неправда" in classifications:
+            overall = "неправда"
+            # Average confidence of falsehood claims
+            falsehood_confidences = [
+                c for c, cl in zip(confidences, classifications) if cl == "неправда"
+            ]
+            overall_confidence = sum(falsehood_confidences) / len(falsehood_confidences)
+        elif "нейтрально" in classifications:
+            overall = "нейтрально"
+            # Average confidence of neutral claims
+            neutral_confidences = [
+                c for c, cl in zip(confidences, classifications) if cl == "нейтрально"
+            ]
+            overall_confidence = sum(neutral_confidences) / len(neutral_confidences)
+        else:
+            overall = "правда"
+            # Average confidence of truth claims
+            overall_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"STEP 4: Overall: {overall} (confidence: {overall_confidence:.2f})")
+
+    return {
+        "overall_classification": overall,
+        "confidence": overall_confidence,
+        "claims": claim_results
+    }
+
+
 def classify_text(text: str) -> Dict:
     """
     Classify text as "правда", "неправда", or "нейтрально".
@@ -127,101 +356,66 @@ def classify_text(text: str) -> Dict:
     Raises:
         ClassificationException: If classification fails
     """
-    import sys
     try:
-        # Extract claims
-        logger.info("STEP 1: Starting claim extraction...")
-        sys.stdout.flush()
-
-        claims = extract_claims(text)
-        logger.info(f"STEP 1: ✓ Extracted {len(claims)} claims")
-        sys.stdout.flush()
-
-        # Limit claims if needed
-        if len(claims) > settings.max_claims:
-            logger.info(f"STEP 2: Limiting to {settings.max_claims} claims")
-            claims = claims[:settings.max_claims]
-            sys.stdout.flush()
-
-        # Assess each claim
-        logger.info("STEP 3: Starting claim assessment...")
-        sys.stdout.flush()
-
-        claim_results = []
-        for i, claim_text in enumerate(claims, 1):
-            logger.info(f"STEP 3.{i}: Assessing claim: {claim_text[:50]}...")
-            sys.stdout.flush()
-            result = assess_claim(claim_text)
-
-            # Map support score to classification
-            support = result["support"]
-            if support >= settings.truth_threshold:
-                classification = "правда"
-                confidence = support
-            elif support < settings.falsehood_threshold:
-                classification = "неправда"
-                confidence = 1.0 - support
-            else:
-                classification = "нейтрально"
-                confidence = support
-
-            claim_results.append({
-                "claim": claim_text,
-                "classification": classification,
-                "confidence": confidence,
-                "best_evidence": {
-                    "snippet": result["best_proof"]["snippet"],
-                    "source": result["best_proof"]["source"],
-                    "nli_score": result["best_proof"]["nli_score"],
-                    "retrieval_score": result["best_proof"]["retrieval_score"]
-                } if result["best_proof"] else None
-            })
-
-            logger.info(f"STEP 3.{i}: ✓ {classification} (support: {support:.2f})")
-            sys.stdout.flush()
-
-        # Overall classification aggregation
-        logger.info("STEP 4: Aggregating results...")
-        sys.stdout.flush()
-
-        # Use weighted confidence aggregation (new) or pessimistic aggregation (legacy)
-        if settings.use_weighted_aggregation:
-            overall, overall_confidence = aggregate_classifications_weighted(claim_results)
+        claims = extract_text_claims(text)
+        assessments = assess_claims(claims)
+        return build_classification(claims, assessments)
+
+    except Exception as e:
+        raise ClassificationException(
+            f"Classification failed: {str(e)}",
+            details={"text_length": len(text), "error": str(e)}
+        )
+
+
+async def classify_text_async(
+    text: str,
+    embed_executor: Executor,
+    nli_executor: Executor,
+    nli_batcher=None
+) -> Dict:
+    """
+    Classify text without blocking the event loop.
+
+    Runs as a two-stage pipeline on separate executors, so one request's
+    evidence retrieval can overlap another request's NLI scoring:
+
+    1. Evidence retrieval for all claims at once on embed_executor
+    2. One batched NLI call for all (claim, proof) pairs, through
+       nli_batcher (if running) so pairs from concurrent requests share a
+       forward pass, otherwise directly on nli_executor
+
+    Args:
+        text: Input text to classify
+        embed_executor: Executor for embedding + FAISS retrieval
+        nli_executor: Executor for NLI scoring when no batcher is running
+        nli_batcher: Optional NLIBatcher for cross-request NLI batching
+
+    Returns:
+        Same dict as classify_text
+
+    Raises:
+        ClassificationException: If classification fails
+    """
+    loop = asyncio.get_running_loop()
+    try:
+        claims = extract_text_claims(text)
+        top_k = settings.top_k_proofs
+
+        # Stage 1: retrieval (all claims in one encode + search)
+        proofs_per_claim = await loop.run_in_executor(
+            embed_executor, partial(retrieve_proofs_batch, claims, top_k=top_k)
+        )
+
+        # Stage 2: batched NLI
+        pairs, indices = build_nli_pairs(claims, proofs_per_claim)
+        if nli_batcher is not None and nli_batcher.running:
+            scores = await nli_batcher.score(pairs)
         else:
-            # Legacy pessimistic aggregation
-            # Priority: if any "неправда" -> overall "неправда"
-            #           elif any "нейтрально" -> overall "нейтрально"
-            #           else -> overall "правда"
-            classifications = [r["classification"] for r in claim_results]
-            confidences = [r["confidence"] for r in claim_results]
-
-            if "неправда" in classifications:
-                overall = "неправда"
-                # Average confidence of falsehood claims
-                falsehood_confidences = [
-                    c for c, cl in zip(confidences, classifications) if cl == "неправда"
-                ]
-                overall_confidence = sum(falsehood_confidences) / len(falsehood_confidences)
-            elif "нейтрально" in classifications:
-                overall = "нейтрально"
-                # Average confidence of neutral claims
-                neutral_confidences = [
-                    c for c, cl in zip(confidences, classifications) if cl == "нейтрально"
-                ]
-                overall_confidence = sum(neutral_confidences) / len(neutral_confidences)
-            else:
-                overall = "правда"
-                # Average confidence of truth claims
-                overall_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-
-        logger.info(f"STEP 4: ✓ Overall: {overall} (confidence: {overall_confidence:.2f})")
-        sys.stdout.flush()
-
-        return {
-            "overall_classification": overall,
-            "confidence": overall_confidence,
-            "claims": claim_results
-        }
+            scores = await loop.run_in_executor(nli_executor, nli_score_batch, pairs)
+
+        assessments = apply_nli_scores(claims, proofs_per_claim, indices, scores)
+        return build_classification(claims, assessments)
 
     except Exception as e:
         raise ClassificationException(
@@ -1,4 +1,6 @@
 import faiss
+import numpy as np
+import torch
 from typing import List, Dict
 import logging
 
@@ -9,20 +11,27 @@ from app.core.exceptions import EvidenceRetrievalException
 logger = logging.getLogger(__name__)
 
 
-def retrieve_proofs(claim: str, top_k: int = None) -> List[Dict[str, any]]:
+def retrieve_proofs_batch(claims: List[str], top_k: int = None) -> List[List[Dict[str, any]]]:
     """
-    Retrieve evidence snippets for a claim using FAISS similarity search.
+    Retrieve evidence snippets for several claims with one encode and one search.
+
+    All claims are embedded in a single embed_model.encode call and looked
+    up with a single FAISS search over the (num_claims, dim) query matrix.
 
     Args:
-        claim: The claim text to find evidence for
-        top_k: Number of top evidence snippets to return. If None, uses settings.top_k_proofs
+        claims: The claim texts to find evidence for
+        top_k: Number of top evidence snippets per claim. If None, uses settings.top_k_proofs
 
     Returns:
-        List of dicts with keys: snippet, source, retrieval_score
+        List of proof lists (one per claim, same order); each proof is a dict
+        with keys: snippet, source, retrieval_score
 
     Raises:
         EvidenceRetrievalException: If evidence retrieval fails
     """
+    if not claims:
+        return []
+
     try:
         if top_k is None:
             top_k = settings.top_k_proofs
@@ -33,54 +42,74 @@ def retrieve_proofs(claim: str, top_k: int = None) -> List[Dict[str, any]]:
         index = mm.get_index()
         kb_docs = mm.get_snippets()
 
-        # Encode claim with error handling
-        try:
-            logger.debug(f"Encoding claim: {claim[:50]}...")
-            emb = embed_model.encode([claim], convert_to_numpy=True, show_progress_bar=False)
-        except BaseException as e:
-            logger.error(f"Encoding failed: {str(e)}", exc_info=True)
-            raise EvidenceRetrievalException(
-                f"Failed to encode claim: {str(e)}",
-                details={"claim": claim[:50], "error_type": type(e).__name__}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Encoding {len(claims)} claims, searching top_k={top_k}")
+        # L2-normalized on the model's device, so no separate normalize_L2 pass
+        with torch.inference_mode():
+            emb = embed_model.encode(
+                claims,
+                batch_size=32,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False
             )
+        # FAISS needs C-contiguous float32 (no copy if already so)
+        emb = np.ascontiguousarray(emb, dtype=np.float32)
 
-        # Normalize embedding
-        try:
-            faiss.normalize_L2(emb)
-        except BaseException as e:
-            logger.error(f"Normalization failed: {str(e)}", exc_info=True)
-            raise EvidenceRetrievalException(
-                f"Failed to normalize embedding: {str(e)}",
-                details={"error_type": type(e).__name__}
-            )
+        # HNSW needs a search depth of a few times top_k for good recall
+        if isinstance(index, faiss.IndexHNSW):
+            ef_search = max(settings.faiss_hnsw_ef_search, top_k * 4)
+            if index.hnsw.efSearch < ef_search:
+                index.hnsw.efSearch = ef_search
 
         # FAISS search
-        try:
-            logger.debug(f"Searching FAISS index (top_k={top_k})...")
-            D, I = index.search(emb, top_k)
-        except BaseException as e:
-            logger.error(f"FAISS search failed: {str(e)}", exc_info=True)
-            raise EvidenceRetrievalException(
-                f"FAISS search failed: {str(e)}",
-                details={"top_k": top_k, "error_type": type(e).__name__}
-            )
+        D, I = index.search(emb, top_k)
 
-        # Build results with index validation
-        results = []
-        for i, score in zip(I[0], D[0]):
-            if i < 0 or i >= len(kb_docs):
-                logger.warning(f"FAISS returned out-of-bounds index: {i}")
-                continue
-            results.append({
-                "snippet": kb_docs[i]["snippet"],
-                "source": kb_docs[i]["source"],
-                "retrieval_score": float(score)
-            })
+        # Build results with index validation, one row per claim
+        proofs_per_claim = []
+        for row_ids, row_scores in zip(I, D):
+            results = []
+            for i, score in zip(row_ids, row_scores):
+                if i < 0 or i >= len(kb_docs):
+                    logger.warning(f"FAISS returned out-of-bounds index: {i}")
+                    continue
+                doc = kb_docs[i]
+                results.append({
+                    "snippet": doc["snippet"],
+                    "source": doc["source"],
+                    "retrieval_score": float(score)
+                })
+            proofs_per_claim.append(results)
 
-        return results
+        return proofs_per_claim
 
     except Exception as e:
         raise EvidenceRetrievalException(
             f"Failed to retrieve evidence: {str(e)}",
-            details={"claim": claim[:50], "top_k": top_k, "error": str(e)}
+            details={
+                "claim": claims[0][:50],
+                "num_claims": len(claims),
+                "top_k": top_k,
+                "error": str(e),
+                "error_type": type(e).__name__
+            }
         )
+
+
+def retrieve_proofs(claim: str, top_k: int = None) -> List[Dict[str, any]]:
+    """
+    Retrieve evidence snippets for a claim using FAISS similarity search.
+
+    Prefer retrieve_proofs_batch when retrieving for more than one claim.
+
+    Args:
+        claim: The claim text to find evidence for
+        top_k: Number of top evidence snippets to return. If None, uses settings.top_k_proofs
+
+    Returns:
+        List of dicts with keys: snippet, source, retrieval_score
+
+    Raises:
+        EvidenceRetrievalException: If evidence retrieval fails
+    """
+    return retrieve_proofs_batch([claim], top_k=top_k)[0]
@@ -0,0 +1,166 @@
+"""
+Cross-request micro-batching for NLI scoring.
+
+Concurrent /classify requests each produce a handful of (claim, snippet)
+pairs. Instead of running one NLI forward pass per request, a single
+background task collects pairs from all in-flight requests for a few
+milliseconds and scores them together with nli_score_batch.
+"""
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import List, Optional, Tuple
+
+from app.core.config import settings
+from app.services.nli_verifier import nli_score_batch
+
+logger = logging.getLogger(__name__)
+
+
+class NLIBatcher:
+    """
+    Single-worker NLI scoring loop fed by an asyncio.Queue.
+
+    Requests put (pairs, future) on the queue and await the future. The
+    server loop takes the first waiting request, keeps collecting more for
+    up to max_wait seconds (or until max_pairs pairs are pending), runs one
+    nli_score_batch call on the executor and resolves every future with its
+    own slice of the scores.
+    """
+
+    def __init__(self, executor: Executor, max_wait: float = None, max_pairs: int = None):
+        self._executor = executor
+        self.max_wait = max_wait if max_wait is not None else settings.nli_batch_wait_ms / 1000
+        self.max_pairs = max_pairs if max_pairs is not None else settings.nli_max_batch_pairs
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # Requests taken off the queue but not yet resolved
+        self._in_flight: List[Tuple[List[Tuple[str, str]], asyncio.Future]] = []
+
+    @property
+    def running(self) -> bool:
+        """Whether the server loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the server loop on the running event loop."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._server_loop(), name="nli-batcher")
+        logger.info(
+            f"NLI batcher started (max_wait={self.max_wait * 1000:.0f}ms, max_pairs={self.max_pairs})"
+        )
+
+    async def stop(self) -> None:
+        """Stop the server loop, failing queued and in-flight requests."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+        pending = self._in_flight
+        self._in_flight = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("NLI batcher stopped"))
+
+    async def score(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """
+        Score (claim, snippet) pairs, batched with other concurrent requests.
+
+        Args:
+            pairs: List of (claim, snippet) tuples
+
+        Returns:
+            List of entailment scores in the same order as pairs
+
+        Raises:
+            RuntimeError: If the batcher is not running
+            NLIVerificationException: If NLI verification fails
+        """
+        if not pairs:
+            return []
+        if not self.running:
+            raise RuntimeError("NLI batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((pairs, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[Tuple[str, str]], asyncio.Future]]:
+        """Wait for one request, then gather more until max_wait or max_pairs."""
+        loop = asyncio.get_running_loop()
+        # Collected items live on the instance so stop() can fail them
+        items = self._in_flight
+        items.append(await self._queue.get())
+        num_pairs = len(items[0][0])
+        deadline = loop.time() + self.max_wait
+
+        while num_pairs < self.max_pairs:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            num_pairs += len(item[0])
+
+        return items
+
+    async def _score_separately(self, items: List[Tuple[List[Tuple[str, str]], asyncio.Future]]) -> None:
+        """Score each request's pairs in its own NLI call, so errors only reach their owner."""
+        loop = asyncio.get_running_loop()
+        for pairs, future in items:
+            if future.done():
+                continue
+            try:
+                scores = await loop.run_in_executor(self._executor, nli_score_batch, pairs)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(scores)
+
+    async def _server_loop(self) -> None:
+        """Collect micro-batches and fan NLI results back out to requests."""
+        loop = asyncio.get_running_loop()
+        while True:
+            self._in_flight = []
+            items = await self._collect()
+            # Skip requests that were cancelled (e.g. timed out) while queued
+            items = [(pairs, future) for pairs, future in items if not future.done()]
+            self._in_flight = items
+            if not items:
+                continue
+
+            all_pairs = [pair for pairs, _ in items for pair in pairs]
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"NLI batch: {len(all_pairs)} pairs from {len(items)} requests")
+
+            try:
+                scores = await loop.run_in_executor(self._executor, nli_score_batch, all_pairs)
+            except Exception as e:
+                if len(items) == 1:
+                    if not items[0][1].done():
+                        items[0][1].set_exception(e)
+                else:
+                    # Don't fail every request for one bad input: rescore each on its own
+                    logger.warning(f"NLI batch of {len(items)} requests failed, rescoring separately: {str(e)}")
+                    await self._score_separately(items)
+                continue
+
+            offset = 0
+            for pairs, future in items:
+                if not future.done():
+                    future.set_result(scores[offset:offset + len(pairs)])
+                offset += len(pairs)
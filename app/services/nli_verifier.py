@@ -1,69 +1,182 @@
+import threading
+from typing import List, Tuple
+
+import torch
+from cachetools import LRUCache
+
 from app.core.models import ModelManager
+from app.core.config import settings
 from app.core.exceptions import NLIVerificationException
 
+# KB snippets are shared across claims and requests, so identical
+# (premise, hypothesis) pairs recur; cache their scores to skip the model.
+_score_cache = LRUCache(maxsize=max(settings.nli_cache_size, 1))
+_score_cache_lock = threading.Lock()
 
-def nli_score(claim: str, snippet: str, use_context: bool = None) -> float:
+
+def clear_nli_cache() -> None:
+    """Clear cached NLI scores."""
+    with _score_cache_lock:
+        _score_cache.clear()
+
+
+def _entailment_index(model) -> int:
+    """Find the ENTAILMENT column in the model's output logits."""
+    for label, idx in model.config.label2id.items():
+        if 'ENTAIL' in label.upper():
+            return idx
+    raise NLIVerificationException(
+        "NLI model has no entailment label",
+        details={"labels": list(model.config.label2id)}
+    )
+
+
+def _score_logits(logits, ent_idx: int) -> List[float]:
+    """Turn a batch of NLI logits into entailment scores (0.0 unless ENTAILMENT wins)."""
+    probs = logits.softmax(dim=-1)
+    is_entailment = probs.argmax(dim=-1) == ent_idx
+    scores = torch.where(is_entailment, probs[:, ent_idx], torch.zeros_like(probs[:, ent_idx]))
+    return [float(s) for s in scores.tolist()]
+
+
+def _run_model(model, tokenizer, premises: List[str], hypotheses: List[str]) -> List[float]:
     """
-    Calculate NLI (Natural Language Inference) entailment score.
+    Score premise/hypothesis pairs with the NLI model in length-sorted sub-batches.
 
-    Uses roberta-large-mnli to determine if the snippet entails the claim.
+    Pairs are sorted by token length and run in sub-batches of
+    settings.nli_batch_size. Each sub-batch is only padded to its own
+    longest pair, so short claims don't pay attention FLOPs for long ones.
+    """
+    # Premise and hypothesis go to the tokenizer as a text pair, which adds
+    # roberta's </s></s> separator ids itself. longest_first truncation never
+    # fails, even when a (token-dense) claim alone exceeds max_length. No
+    # padding here: lengths are needed to bucket the pairs first.
+    features = tokenizer(
+        premises,
+        hypotheses,
+        truncation=True,
+        max_length=settings.nli_max_length
+    )
+    input_ids = features["input_ids"]
+    attention_mask = features["attention_mask"]
+
+    order = sorted(range(len(premises)), key=lambda i: len(input_ids[i]))
+    ent_idx = _entailment_index(model)
+    scores = [0.0] * len(premises)
+
+    for start in range(0, len(order), settings.nli_batch_size):
+        bucket = order[start:start + settings.nli_batch_size]
+        batch = tokenizer.pad(
+            {
+                "input_ids": [input_ids[i] for i in bucket],
+                "attention_mask": [attention_mask[i] for i in bucket]
+            },
+            return_tensors="pt"
+        ).to(model.device)
+
+        with torch.inference_mode():
+            logits = model(**batch).logits
+
+        # Scatter bucket results back to the original pair order
+        for i, score in zip(bucket, _score_logits(logits, ent_idx)):
+            scores[i] = score
+
+    return scores
+
+
+def nli_score_batch(pairs: List[Tuple[str, str]], use_context: bool = None) -> List[float]:
+    """
+    Calculate NLI entailment scores for many (claim, snippet) pairs at once.
+
+    Pairs are scored by roberta-large-mnli with the snippet as premise and
+    the claim as hypothesis, in length-sorted sub-batches. Scores of
+    previously seen pairs come from an LRU cache (settings.nli_cache_size).
+
+    A pair scores its entailment probability when ENTAILMENT is the
+    predicted label, and 0.0 otherwise (same as the top-1 output of the
+    text-classification pipeline the thresholds were tuned on).
 
     Args:
-        claim: The hypothesis/claim to verify
-        snippet: The premise/evidence text
+        pairs: List of (claim, snippet) tuples
         use_context: Whether to add "Established fact:" prefix (None = use settings)
 
     Returns:
-        Float between 0.0 and 1.0 representing entailment probability
+        List of floats between 0.0 and 1.0, in the same order as pairs
 
     Raises:
         NLIVerificationException: If NLI verification fails
     """
+    if not pairs:
+        return []
+
     try:
-        # Get NLI pipeline
         mm = ModelManager.get_instance()
-        nli = mm.get_nli()
+        model = mm.get_nli()
+        tokenizer = mm.get_nli_tokenizer()
 
-        # Get feature flag from settings if not explicitly provided
-        from app.core.config import settings
         if use_context is None:
             use_context = settings.use_nli_context
 
-        # Format: premise </s></s> hypothesis
-        # This is the format roberta-large-mnli expects
         # Optional contextual prefix to guide model toward recognizing established facts
-        if use_context:
-            hypothesis = f"Established fact: {claim}"
-        else:
-            hypothesis = claim
-
-        premise = snippet
-        input_text = f"{premise} </s></s> {hypothesis}"
-
-        # Run NLI pipeline
-        result = nli(input_text)
-
-        # Extract entailment score
-        # Result is a list of dicts with 'label' and 'score'
-        if isinstance(result, list):
-            ent_score = None
-            for r in result:
-                label = r['label'].upper()
-                if 'ENTAIL' in label:
-                    ent_score = r['score']
-                    break
-
-            # If no entailment label found, return 0.0
-            if ent_score is None:
-                ent_score = 0.0
-
-            return float(ent_score)
-        else:
-            # Fallback
-            return 0.0
+        prefix = "Established fact: " if use_context else ""
+        # Cut long texts before tokenizing; the token limit would drop the
+        # excess anyway, this just saves tokenizer work on very long snippets
+        max_premise = settings.nli_max_premise_chars
+        max_hypothesis = settings.nli_max_hypothesis_chars
+        keys = [
+            (snippet[:max_premise], (prefix + claim)[:max_hypothesis])
+            for claim, snippet in pairs
+        ]
+
+        use_cache = settings.nli_cache_size > 0
+        scores = [None] * len(pairs)
+        if use_cache:
+            with _score_cache_lock:
+                for i, key in enumerate(keys):
+                    scores[i] = _score_cache.get(key)
 
+        # Run the model only for pairs not in the cache (deduplicated)
+        missing = list(dict.fromkeys(key for key, score in zip(keys, scores) if score is None))
+        if missing:
+            computed = _run_model(
+                model,
+                tokenizer,
+                [premise for premise, _ in missing],
+                [hypothesis for _, hypothesis in missing]
+            )
+            computed = dict(zip(missing, computed))
+            if use_cache:
+                with _score_cache_lock:
+                    _score_cache.update(computed)
+            scores = [computed[key] if score is None else score for key, score in zip(keys, scores)]
+
+        return scores
+
+    except NLIVerificationException:
+        raise
     except Exception as e:
         raise NLIVerificationException(
             f"NLI verification failed: {str(e)}",
-            details={"claim": claim[:50], "evidence": snippet[:50], "error": str(e)}
+            details={"num_pairs": len(pairs), "error": str(e)}
         )
+
+
+def nli_score(claim: str, snippet: str, use_context: bool = None) -> float:
+    """
+    Calculate NLI (Natural Language Inference) entailment score.
+
+    Uses roberta-large-mnli to determine if the snippet entails the claim.
+    Prefer nli_score_batch when scoring more than one pair.
+
+    Args:
+        claim: The hypothesis/claim to verify
+        snippet: The premise/evidence text
+        use_context: Whether to add "Established fact:" prefix (None = use settings)
+
+    Returns:
+        Float between 0.0 and 1.0 representing entailment probability
+
+    Raises:
+        NLIVerificationException: If NLI verification fails
+    """
+    return nli_score_batch([(claim, snippet)], use_context=use_context)[0]
@@ -46,6 +46,11 @@ def check_environment():
     except ImportError:
         missing_packages.append('tqdm')
 
+    try:
+        import pyarrow
+    except ImportError:
+        missing_packages.append('pyarrow')
+
     if missing_packages:
         print(f"❌ ERROR: Missing required packages: {', '.join(missing_packages)}")
         print("\nPlease install dependencies:")
@@ -58,13 +63,36 @@ def check_environment():
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from tqdm import tqdm
 
 from app.utils.wikipedia_kb import build_kb_snippets
 from app.core.config import settings
+from app.core.models import load_embedding_model
+
+
+def build_index(embeddings: np.ndarray) -> faiss.Index:
+    """
+    Build the FAISS index for L2-normalized snippet embeddings.
+
+    Uses exact inner product (cosine similarity) search by default. With
+    FAISS_INDEX_TYPE=hnsw an approximate HNSW graph is built instead, which
+    only pays off for KBs of several thousand snippets or more.
+    """
+    d = embeddings.shape[1]
+    if settings.faiss_index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(d, settings.faiss_hnsw_m, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = settings.faiss_hnsw_ef_construction
+    elif settings.faiss_index_type == "flat":
+        index = faiss.IndexFlatIP(d)  # Inner product for cosine similarity
+    else:
+        raise ValueError(f"Unknown FAISS_INDEX_TYPE: {settings.faiss_index_type}")
+
+    index.add(embeddings)
+    return index
 
 
 def main():
@@ -83,20 +111,18 @@ def main():
 
     # Load embedding model
     print(f"\nLoading embedding model: {settings.embedding_model}")
-    embed_model = SentenceTransformer(settings.embedding_model)
+    embed_model = load_embedding_model()
 
     # Encode snippets
     print("\nEncoding KB snippets (this may take some time)...")
     embeddings = embed_model.encode(snippets, show_progress_bar=True, convert_to_numpy=True)
 
     # Build FAISS index
-    print("\nBuilding FAISS index...")
-    d = embeddings.shape[1]
-    index = faiss.IndexFlatIP(d)  # Inner product for cosine similarity
+    print(f"\nBuilding FAISS index ({settings.faiss_index_type})...")
 
     # Normalize vectors for cosine similarity via inner product
     faiss.normalize_L2(embeddings)
-    index.add(embeddings)
+    index = build_index(embeddings)
 
     print(f"FAISS index built with {index.ntotal} vectors")
 
@@ -108,14 +134,25 @@ def main():
     print(f"\nSaving FAISS index to: {settings.faiss_index_path}")
     faiss.write_index(index, str(settings.faiss_index_path))
 
-    # Save KB snippets metadata
-    print(f"Saving KB snippets metadata to: {settings.kb_snippets_path}")
+    # Save KB snippets metadata (columnar, loaded as Arrow arrays by the API)
+    print(f"Saving KB snippets metadata to: {settings.kb_metadata_path}")
+    pq.write_table(
+        pa.table({
+            "snippet": snippets,
+            "source": [d["source"] for d in kb_docs]
+        }),
+        settings.kb_metadata_path
+    )
+
+    # Human-readable copy, also used as fallback when the Parquet file is missing
+    print(f"Saving KB snippets JSON to: {settings.kb_snippets_path}")
     with open(settings.kb_snippets_path, "w", encoding="utf-8") as f:
         json.dump(kb_docs, f, ensure_ascii=False, indent=2)
 
     print("\n✓ Knowledge Base built successfully!")
     print(f"  - Index file: {settings.faiss_index_path}")
-    print(f"  - Metadata file: {settings.kb_snippets_path}")
+    print(f"  - Metadata file: {settings.kb_metadata_path}")
+    print(f"  - JSON metadata: {settings.kb_snippets_path}")
     print(f"  - Total snippets: {len(kb_docs)}")
 
 
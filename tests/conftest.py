@@ -1,9 +1,13 @@
 import pytest
 import numpy as np
+import torch
+from types import SimpleNamespace
 from unittest.mock import Mock, MagicMock
+from transformers import BatchEncoding
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.models import ModelManager
+from app.services.nli_verifier import clear_nli_cache
 
 
 @pytest.fixture
@@ -25,14 +29,59 @@ def mock_embed_model():
 
 
 @pytest.fixture
-def mock_nli_pipeline():
+def mock_nli_model():
     """
-    Mock HuggingFace NLI pipeline (roberta-large-mnli).
+    Mock roberta-large-mnli sequence classification model.
 
-    Returns entailment classification results.
+    Every input pair gets logits whose softmax equals ``mock.probs``
+    (CONTRADICTION, NEUTRAL, ENTAILMENT). Set ``mock.probs`` to change the
+    predicted label and entailment probability.
     """
     mock = Mock()
-    mock.return_value = [{"label": "ENTAILMENT", "score": 0.92}]
+    mock.device = torch.device("cpu")
+    mock.config.label2id = {"CONTRADICTION": 0, "NEUTRAL": 1, "ENTAILMENT": 2}
+    mock.probs = [0.03, 0.05, 0.92]
+
+    def forward(input_ids, attention_mask, **kwargs):
+        probs = torch.tensor([mock.probs] * input_ids.shape[0], dtype=torch.float64)
+        return SimpleNamespace(logits=torch.log(probs))
+
+    mock.side_effect = forward
+    return mock
+
+
+@pytest.fixture
+def mock_nli_tokenizer():
+    """
+    Mock roberta-large-mnli tokenizer.
+
+    Calling it with lists of premises and hypotheses returns unpadded
+    token ids (one token per word plus 4 special tokens); ``pad`` turns a
+    list of those into padded tensors.
+    """
+    mock = Mock()
+
+    def tokenize(premises, hypotheses, **kwargs):
+        input_ids = [
+            [1] * (len(p.split()) + len(h.split()) + 4)
+            for p, h in zip(premises, hypotheses)
+        ]
+        return BatchEncoding({
+            "input_ids": input_ids,
+            "attention_mask": [[1] * len(ids) for ids in input_ids]
+        })
+
+    def pad(features, **kwargs):
+        max_len = max(len(ids) for ids in features["input_ids"])
+        input_ids = torch.zeros((len(features["input_ids"]), max_len), dtype=torch.long)
+        attention_mask = torch.zeros_like(input_ids)
+        for row, ids in enumerate(features["input_ids"]):
+            input_ids[row, :len(ids)] = 1
+            attention_mask[row, :len(ids)] = 1
+        return BatchEncoding({"input_ids": input_ids, "attention_mask": attention_mask})
+
+    mock.side_effect = tokenize
+    mock.pad.side_effect = pad
     return mock
 
 
@@ -91,7 +140,7 @@ def mock_kb_snippets():
 
 
 @pytest.fixture
-def mock_model_manager(mock_embed_model, mock_nli_pipeline, mock_faiss_index, mock_kb_snippets):
+def mock_model_manager(mock_embed_model, mock_nli_model, mock_nli_tokenizer, mock_faiss_index, mock_kb_snippets):
     """
     Complete mocked ModelManager with all models initialized.
 
@@ -104,15 +153,17 @@ def mock_model_manager(mock_embed_model, mock_nli_pipeline, mock_faiss_index, mo
     Cleanup:
         Resets ModelManager singleton after test
     """
-    # Reset singleton
+    # Reset singleton and cached NLI scores
     ModelManager._instance = None
+    clear_nli_cache()
 
     # Create new instance
     mm = ModelManager.get_instance()
 
     # Inject mocks
     mm._embed_model = mock_embed_model
-    mm._nli_pipeline = mock_nli_pipeline
+    mm._nli_model = mock_nli_model
+    mm._nli_tokenizer = mock_nli_tokenizer
     mm._faiss_index = mock_faiss_index
     mm._kb_snippets = mock_kb_snippets
 
@@ -0,0 +1,130 @@
+import json
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+from app.core.cache import (
+    CACHE_KEY_VERSION,
+    REDIS_KEY_PREFIX,
+    get_cache_key,
+    get_cached_result,
+    get_cache_info,
+    cache_result,
+    clear_cache,
+    init_cache,
+)
+from app.core.exceptions import CacheException
+
+
+@pytest.fixture(autouse=True)
+async def empty_cache():
+    """Start and finish every test with an empty response cache."""
+    await clear_cache()
+    yield
+    await clear_cache()
+
+
+@pytest.fixture
+def mock_redis():
+    """Async Redis client mock installed as the shared cache client."""
+    client = Mock()
+    client.get = AsyncMock(return_value=None)
+    client.set = AsyncMock()
+    client.ping = AsyncMock(return_value=True)
+    with patch('app.core.config.settings.cache_backend', "redis"), \
+         patch('app.core.cache._redis', client):
+        yield client
+
+
+@pytest.mark.unit
+def test_cache_key_is_deterministic():
+    """Test that the same text always maps to the same key."""
+    text = "Albert Einstein was born in 1879."
+
+    assert get_cache_key(text) == get_cache_key(text)
+
+
+@pytest.mark.unit
+def test_cache_key_differs_for_different_text():
+    """Test that different texts map to different keys."""
+    assert get_cache_key("Einstein was born in 1879.") != get_cache_key("Einstein was born in 1880.")
+
+
+@pytest.mark.unit
+def test_cache_key_is_versioned():
+    """Test that keys carry the cache version prefix and a 64-bit hex digest."""
+    key = get_cache_key("Python is a programming language.")
+
+    prefix, digest = key.split(":")
+    assert prefix == CACHE_KEY_VERSION
+    assert len(digest) == 16
+    int(digest, 16)
+
+
+@pytest.mark.unit
+async def test_cache_roundtrip():
+    """Test that a cached result is returned for the same text."""
+    text = "Albert Einstein was born in 1879."
+    result = {"overall_classification": "правда", "confidence": 0.9, "claims": []}
+
+    assert await get_cached_result(text) is None
+    await cache_result(text, result)
+    assert await get_cached_result(text) == result
+
+
+@pytest.mark.unit
+async def test_redis_backend_stores_json_with_ttl(mock_redis):
+    """Test that the Redis backend writes JSON under a namespaced key with the TTL."""
+    text = "Albert Einstein was born in 1879."
+    result = {"overall_classification": "правда", "confidence": 0.9, "claims": []}
+
+    await cache_result(text, result)
+
+    key, value = mock_redis.set.call_args[0]
+    assert key == REDIS_KEY_PREFIX + get_cache_key(text)
+    assert json.loads(value) == result
+    assert mock_redis.set.call_args[1]["ex"] == 300
+
+
+@pytest.mark.unit
+async def test_redis_backend_decodes_hit(mock_redis):
+    """Test that a Redis hit is JSON-decoded."""
+    result = {"overall_classification": "неправда", "confidence": 0.7, "claims": []}
+    mock_redis.get.return_value = json.dumps(result).encode("utf-8")
+
+    assert await get_cached_result("Some text") == result
+
+
+@pytest.mark.unit
+async def test_redis_errors_are_cache_misses(mock_redis):
+    """Test that Redis connection errors don't fail the request."""
+    mock_redis.get.side_effect = ConnectionError("redis down")
+    mock_redis.set.side_effect = ConnectionError("redis down")
+
+    assert await get_cached_result("Some text") is None
+    await cache_result("Some text", {"overall_classification": "правда"})
+
+
+@pytest.mark.unit
+async def test_redis_corrupt_value_is_cache_miss(mock_redis):
+    """Test that an undecodable cached value is treated as a miss."""
+    mock_redis.get.return_value = b"not json"
+
+    assert await get_cached_result("Some text") is None
+
+
+@pytest.mark.unit
+async def test_init_cache_fails_when_redis_unreachable(mock_redis):
+    """Test that an unreachable Redis fails at startup instead of per request."""
+    mock_redis.ping.side_effect = ConnectionError("connection refused")
+
+    with pytest.raises(CacheException):
+        await init_cache()
+
+
+@pytest.mark.unit
+async def test_redis_cache_info_does_not_scan(mock_redis):
+    """Test that /cache-info doesn't walk the Redis keyspace."""
+    info = await get_cache_info()
+
+    assert info["backend"] == "redis"
+    assert info["size"] is None
+    mock_redis.scan_iter.assert_not_called()
@@ -7,18 +7,18 @@ from app.core.exceptions import ClassificationException
 @pytest.mark.unit
 def test_assess_claim_returns_correct_structure(mock_model_manager):
     """Test that assess_claim returns dict with correct keys."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
-
-        # Mock retrieve_proofs to return 3 proofs
-        mock_retrieve.return_value = [
-            {"snippet": "Proof 1", "source": "https://example.com/1", "retrieval_score": 0.1},
-            {"snippet": "Proof 2", "source": "https://example.com/2", "retrieval_score": 0.2},
-            {"snippet": "Proof 3", "source": "https://example.com/3", "retrieval_score": 0.3}
-        ]
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        # Mock retrieve_proofs_batch to return 3 proofs per claim
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Proof 1", "source": "https://example.com/1", "retrieval_score": 0.6},
+            {"snippet": "Proof 2", "source": "https://example.com/2", "retrieval_score": 0.5},
+            {"snippet": "Proof 3", "source": "https://example.com/3", "retrieval_score": 0.4}
+        ] for _ in claims]
 
-        # Mock nli_score to return different scores
-        mock_nli.side_effect = [0.92, 0.78, 0.65]
+        # Mock nli_score_batch to return different scores
+        mock_nli.return_value = [0.92, 0.78, 0.65]
 
         result = assess_claim("Test claim")
 
@@ -33,13 +33,13 @@ def test_assess_claim_returns_correct_structure(mock_model_manager):
 @pytest.mark.unit
 def test_assess_claim_high_support_score(mock_model_manager):
     """Test assess_claim with high NLI scores returns high support."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.95
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.95] * len(pairs)
 
         result = assess_claim("Test claim")
 
@@ -50,16 +50,16 @@ def test_assess_claim_high_support_score(mock_model_manager):
 @pytest.mark.unit
 def test_assess_claim_selects_best_proof(mock_model_manager):
     """Test that assess_claim selects proof with highest NLI score."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
-
-        mock_retrieve.return_value = [
-            {"snippet": "Weak evidence", "source": "https://example.com/1", "retrieval_score": 0.1},
-            {"snippet": "Strong evidence", "source": "https://example.com/2", "retrieval_score": 0.2},
-            {"snippet": "Medium evidence", "source": "https://example.com/3", "retrieval_score": 0.15}
-        ]
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Weak evidence", "source": "https://example.com/1", "retrieval_score": 0.6},
+            {"snippet": "Strong evidence", "source": "https://example.com/2", "retrieval_score": 0.5},
+            {"snippet": "Medium evidence", "source": "https://example.com/3", "retrieval_score": 0.4}
+        ] for _ in claims]
         # NLI scores: 0.6, 0.9, 0.7
-        mock_nli.side_effect = [0.6, 0.9, 0.7]
+        mock_nli.return_value = [0.6, 0.9, 0.7]
 
         result = assess_claim("Test claim")
 
@@ -71,15 +71,15 @@ def test_assess_claim_selects_best_proof(mock_model_manager):
 @pytest.mark.unit
 def test_assess_claim_uses_default_top_k(mock_model_manager):
     """Test that assess_claim uses settings.top_k_proofs when top_k not specified."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
-        mock_retrieve.return_value = []
-        mock_nli.return_value = 0.5
+        mock_retrieve.side_effect = lambda claims, top_k: [[] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.5] * len(pairs)
 
         assess_claim("Test claim")
 
-        # Should call retrieve_proofs with default top_k (10, updated from 6)
+        # Should call retrieve_proofs_batch with default top_k (10, updated from 6)
         mock_retrieve.assert_called_once()
         call_kwargs = mock_retrieve.call_args[1]
         assert call_kwargs.get("top_k") == 10
@@ -88,15 +88,15 @@ def test_assess_claim_uses_default_top_k(mock_model_manager):
 @pytest.mark.unit
 def test_assess_claim_custom_top_k(mock_model_manager):
     """Test assess_claim with custom top_k parameter."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
-        mock_retrieve.return_value = []
-        mock_nli.return_value = 0.5
+        mock_retrieve.side_effect = lambda claims, top_k: [[] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.5] * len(pairs)
 
         assess_claim("Test claim", top_k=3)
 
-        # Should call retrieve_proofs with top_k=3
+        # Should call retrieve_proofs_batch with top_k=3
         call_kwargs = mock_retrieve.call_args[1]
         assert call_kwargs.get("top_k") == 3
 
@@ -105,17 +105,17 @@ def test_assess_claim_custom_top_k(mock_model_manager):
 def test_classify_text_truth_classification(mock_model_manager):
     """Test classify_text with text that should classify as 'правда'."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         # Mock one claim
         mock_extract.return_value = ["Einstein was born in 1879."]
 
         # Mock high NLI score (>= 0.85 = truth threshold)
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.92
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.92] * len(pairs)
 
         result = classify_text("Einstein was born in 1879.")
 
@@ -129,17 +129,17 @@ def test_classify_text_truth_classification(mock_model_manager):
 def test_classify_text_falsehood_classification(mock_model_manager):
     """Test classify_text with text that should classify as 'неправда'."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         # Mock one claim
         mock_extract.return_value = ["Einstein was born in 1990."]
 
         # Mock low NLI score (< 0.4 = falsehood threshold)
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.25
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.25] * len(pairs)
 
         result = classify_text("Einstein was born in 1990.")
 
@@ -153,17 +153,17 @@ def test_classify_text_falsehood_classification(mock_model_manager):
 def test_classify_text_neutral_classification(mock_model_manager):
     """Test classify_text with text that should classify as 'нейтрально'."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         # Mock one claim
         mock_extract.return_value = ["The future is uncertain."]
 
         # Mock medium NLI score (0.4 <= score < 0.85)
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.6
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.6] * len(pairs)
 
         result = classify_text("The future is uncertain.")
 
@@ -177,8 +177,8 @@ def test_classify_text_neutral_classification(mock_model_manager):
 def test_classify_text_mixed_claims_falsehood_priority(mock_model_manager):
     """Test that any 'неправда' claim makes overall classification 'неправда' (legacy pessimistic aggregation)."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.use_weighted_aggregation', False):
 
         # Mock two claims: one true, one false
@@ -187,13 +187,13 @@ def test_classify_text_mixed_claims_falsehood_priority(mock_model_manager):
             "Python is statically typed."   # False
         ]
 
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
+        ] for _ in claims]
 
         # First claim: high score (truth), second claim: low score (falsehood)
-        # One NLI call per claim (1 proof each)
-        mock_nli.side_effect = [0.92, 0.15]
+        # One batched NLI call (1 proof per claim)
+        mock_nli.return_value = [0.92, 0.15]
 
         result = classify_text("Mixed text")
 
@@ -206,8 +206,8 @@ def test_classify_text_mixed_claims_falsehood_priority(mock_model_manager):
 def test_classify_text_mixed_claims_neutral_priority(mock_model_manager):
     """Test that 'нейтрально' has priority over 'правда' but not 'неправда' (legacy pessimistic aggregation)."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.use_weighted_aggregation', False):
 
         # Mock two claims: one true, one neutral
@@ -216,13 +216,13 @@ def test_classify_text_mixed_claims_neutral_priority(mock_model_manager):
             "The future is uncertain."     # Neutral
         ]
 
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
+        ] for _ in claims]
 
         # First claim: high score (truth), second claim: medium score (neutral)
-        # One NLI call per claim (1 proof each)
-        mock_nli.side_effect = [0.92, 0.6]
+        # One batched NLI call (1 proof per claim)
+        mock_nli.return_value = [0.92, 0.6]
 
         result = classify_text("Mixed text")
 
@@ -234,8 +234,8 @@ def test_classify_text_mixed_claims_neutral_priority(mock_model_manager):
 def test_classify_text_multiple_truth_claims(mock_model_manager):
     """Test classify_text with all claims being true."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         # Mock three true claims
         mock_extract.return_value = [
@@ -244,12 +244,12 @@ def test_classify_text_multiple_truth_claims(mock_model_manager):
             "Earth orbits the Sun."
         ]
 
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
+        ] for _ in claims]
 
         # All high NLI scores
-        mock_nli.return_value = 0.9
+        mock_nli.side_effect = lambda pairs: [0.9] * len(pairs)
 
         result = classify_text("All true text")
 
@@ -262,15 +262,15 @@ def test_classify_text_multiple_truth_claims(mock_model_manager):
 def test_classify_text_confidence_calculation(mock_model_manager):
     """Test that confidence is calculated correctly (legacy pessimistic aggregation)."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.use_weighted_aggregation', False):
 
         mock_extract.return_value = ["Test claim"]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.95
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.95] * len(pairs)
 
         result = classify_text("Test text")
 
@@ -283,14 +283,14 @@ def test_classify_text_confidence_calculation(mock_model_manager):
 def test_classify_text_falsehood_confidence(mock_model_manager):
     """Test that falsehood confidence is 1.0 - support."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         mock_extract.return_value = ["False claim"]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.2  # Low score -> falsehood
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.2] * len(pairs)  # Low score -> falsehood
 
         result = classify_text("False text")
 
@@ -303,14 +303,14 @@ def test_classify_text_falsehood_confidence(mock_model_manager):
 def test_classify_text_includes_best_evidence(mock_model_manager):
     """Test that each claim includes best evidence information."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         mock_extract.return_value = ["Test claim"]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Best evidence", "source": "https://example.com", "retrieval_score": 0.15}
-        ]
-        mock_nli.return_value = 0.88
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.88] * len(pairs)
 
         result = classify_text("Test text")
 
@@ -348,14 +348,14 @@ def test_classify_text_empty_claims_list(mock_model_manager):
 def test_classify_text_calls_extract_claims(mock_model_manager):
     """Test that classify_text calls extract_claims with the input text."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
         mock_extract.return_value = ["Claim"]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.8
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.8] * len(pairs)
 
         classify_text("Input text to classify")
 
@@ -366,17 +366,17 @@ def test_classify_text_calls_extract_claims(mock_model_manager):
 @pytest.mark.unit
 def test_assess_claim_aggregates_max_score(mock_model_manager):
     """Test that assess_claim uses max NLI score as support."""
-    with patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli:
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
 
-        mock_retrieve.return_value = [
-            {"snippet": "Proof 1", "source": "https://example.com/1", "retrieval_score": 0.1},
-            {"snippet": "Proof 2", "source": "https://example.com/2", "retrieval_score": 0.2},
-            {"snippet": "Proof 3", "source": "https://example.com/3", "retrieval_score": 0.3}
-        ]
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Proof 1", "source": "https://example.com/1", "retrieval_score": 0.6},
+            {"snippet": "Proof 2", "source": "https://example.com/2", "retrieval_score": 0.5},
+            {"snippet": "Proof 3", "source": "https://example.com/3", "retrieval_score": 0.4}
+        ] for _ in claims]
 
         # Different NLI scores, max is 0.85
-        mock_nli.side_effect = [0.6, 0.85, 0.7]
+        mock_nli.return_value = [0.6, 0.85, 0.7]
 
         result = assess_claim("Test claim")
 
@@ -388,19 +388,19 @@ def test_assess_claim_aggregates_max_score(mock_model_manager):
 def test_classify_text_overall_confidence_averaging(mock_model_manager):
     """Test that overall confidence is averaged correctly for multiple claims (legacy pessimistic aggregation)."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.use_weighted_aggregation', False):
 
         # Two true claims with different confidences
         mock_extract.return_value = ["Claim 1", "Claim 2"]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
+        ] for _ in claims]
 
         # Scores: 0.90 and 0.88 (both >= 0.75, so both are truth)
-        # One NLI call per claim (1 proof each)
-        mock_nli.side_effect = [0.90, 0.88]
+        # One batched NLI call (1 proof per claim)
+        mock_nli.return_value = [0.90, 0.88]
 
         result = classify_text("Two true claims")
 
@@ -413,16 +413,16 @@ def test_classify_text_overall_confidence_averaging(mock_model_manager):
 def test_classify_with_lowered_threshold(mock_model_manager):
     """Test that 0.75 threshold correctly classifies borderline cases as truth."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.truth_threshold', 0.75), \
          patch('app.core.config.settings.use_weighted_aggregation', False):
 
         mock_extract.return_value = ["Einstein was born in 1879."]
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
-        mock_nli.return_value = 0.78  # Between 0.75 and 0.85
+        ] for _ in claims]
+        mock_nli.side_effect = lambda pairs: [0.78] * len(pairs)  # Between 0.75 and 0.85
 
         result = classify_text("Einstein was born in 1879.")
 
@@ -435,8 +435,8 @@ def test_classify_with_lowered_threshold(mock_model_manager):
 def test_weighted_aggregation_high_confidence_truth_wins(mock_model_manager):
     """Test that high-confidence truths override low-confidence falsehood."""
     with patch('app.services.classifier.extract_claims') as mock_extract, \
-         patch('app.services.classifier.retrieve_proofs') as mock_retrieve, \
-         patch('app.services.classifier.nli_score') as mock_nli, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli, \
          patch('app.core.config.settings.use_weighted_aggregation', True), \
          patch('app.core.config.settings.truth_threshold', 0.75):
 
@@ -446,12 +446,12 @@ def test_weighted_aggregation_high_confidence_truth_wins(mock_model_manager):
             "Einstein won many awards."
         ]
 
-        mock_retrieve.return_value = [
+        mock_retrieve.side_effect = lambda claims, top_k: [[
             {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.1}
-        ]
+        ] for _ in claims]
 
         # Scores: 0.90 (truth), 0.88 (truth), 0.35 (falsehood)
-        mock_nli.side_effect = [0.90, 0.90, 0.88, 0.88, 0.35, 0.35]
+        mock_nli.return_value = [0.90, 0.88, 0.35]
 
         result = classify_text("Mixed claims")
 
@@ -464,16 +464,163 @@ def test_weighted_aggregation_high_confidence_truth_wins(mock_model_manager):
 def test_nli_with_context_prefix(mock_model_manager):
     """Test that contextual prefix is applied correctly when enabled."""
     from app.services.nli_verifier import nli_score
-    from app.core.models import ModelManager
 
     with patch('app.core.config.settings.use_nli_context', True):
-        mock_nli_pipeline = Mock()
-        mock_nli_pipeline.return_value = [{'label': 'ENTAILMENT', 'score': 0.85}]
+        nli_model = mock_model_manager.get_nli()
+        nli_model.probs = [0.05, 0.10, 0.85]
+
+        score = nli_score("Einstein was born in 1879.", "Evidence snippet")
+
+        # Verify context prefix was added to the hypothesis
+        _, hypotheses = mock_model_manager.get_nli_tokenizer().call_args[0]
+        assert hypotheses[0] == "Established fact: Einstein was born in 1879."
+        assert score == pytest.approx(0.85)
+
+
+@pytest.mark.unit
+def test_classify_text_scores_all_claims_in_one_batch(mock_model_manager):
+    """Test that every (claim, proof) pair is scored with a single NLI batch call."""
+    with patch('app.services.classifier.extract_claims') as mock_extract, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_extract.return_value = ["Claim 1", "Claim 2"]
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": f"{claim} proof A", "source": "https://example.com/a", "retrieval_score": 0.6},
+            {"snippet": f"{claim} proof B", "source": "https://example.com/b", "retrieval_score": 0.5}
+        ] for claim in claims]
+        mock_nli.return_value = [0.2, 0.9, 0.1, 0.3]
+
+        result = classify_text("Two claims")
+
+        mock_nli.assert_called_once_with([
+            ("Claim 1", "Claim 1 proof A"),
+            ("Claim 1", "Claim 1 proof B"),
+            ("Claim 2", "Claim 2 proof A"),
+            ("Claim 2", "Claim 2 proof B")
+        ])
+        # Scores are mapped back to the claim they belong to
+        assert result["claims"][0]["best_evidence"]["snippet"] == "Claim 1 proof B"
+        assert result["claims"][0]["classification"] == "правда"
+        assert result["claims"][1]["best_evidence"]["snippet"] == "Claim 2 proof B"
+        assert result["claims"][1]["classification"] == "неправда"
+
+
+@pytest.mark.unit
+def test_assess_claim_skips_nli_for_low_retrieval_scores(mock_model_manager):
+    """Test that proofs below nli_gate_threshold are not sent to NLI and score 0.0."""
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Close match", "source": "https://example.com/1", "retrieval_score": 0.7},
+            {"snippet": "Distant match", "source": "https://example.com/2", "retrieval_score": 0.1},
+            {"snippet": "Good match", "source": "https://example.com/3", "retrieval_score": 0.4}
+        ] for _ in claims]
+        mock_nli.return_value = [0.8, 0.6]
+
+        result = assess_claim("Test claim")
+
+        mock_nli.assert_called_once_with([
+            ("Test claim", "Close match"),
+            ("Test claim", "Good match")
+        ])
+        assert [p["nli_score"] for p in result["all_proofs"]] == [0.8, 0.0, 0.6]
+        assert result["support"] == 0.8
+
+
+@pytest.mark.unit
+def test_assess_claim_always_scores_top_retrieval_proof(mock_model_manager):
+    """Test that the best retrieved proof is scored even below nli_gate_threshold."""
+    with patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Weak", "source": "https://example.com/1", "retrieval_score": 0.2},
+            {"snippet": "Weaker", "source": "https://example.com/2", "retrieval_score": 0.1}
+        ] for _ in claims]
+        mock_nli.return_value = [0.5]
+
+        result = assess_claim("Test claim")
+
+        mock_nli.assert_called_once_with([("Test claim", "Weak")])
+        assert result["best_proof"]["snippet"] == "Weak"
+        assert result["support"] == 0.5
+
+
+@pytest.mark.unit
+async def test_classify_text_async_uses_nli_batcher(mock_model_manager):
+    """Test that classify_text_async sends NLI pairs through the batcher."""
+    from concurrent.futures import ThreadPoolExecutor
+    from unittest.mock import AsyncMock
+    from app.services.classifier import classify_text_async
+
+    with patch('app.services.classifier.extract_claims') as mock_extract, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_extract.return_value = ["Einstein was born in 1879."]
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": "Evidence", "source": "https://example.com", "retrieval_score": 0.6}
+        ] for _ in claims]
+        batcher = Mock(running=True)
+        batcher.score = AsyncMock(return_value=[0.92])
+
+        with ThreadPoolExecutor(max_workers=1) as embed_executor, \
+             ThreadPoolExecutor(max_workers=1) as nli_executor:
+            result = await classify_text_async(
+                "Einstein was born in 1879.", embed_executor, nli_executor, batcher
+            )
+
+        batcher.score.assert_awaited_once_with([("Einstein was born in 1879.", "Evidence")])
+        mock_nli.assert_not_called()
+        assert result["overall_classification"] == "правда"
+        assert result["claims"][0]["best_evidence"]["nli_score"] == 0.92
+
+
+@pytest.mark.unit
+async def test_classify_text_async_without_batcher(mock_model_manager):
+    """Test that classify_text_async retrieves every claim and scores them in one NLI call."""
+    from concurrent.futures import ThreadPoolExecutor
+    from app.services.classifier import classify_text_async
+
+    with patch('app.services.classifier.extract_claims') as mock_extract, \
+         patch('app.services.classifier.retrieve_proofs_batch') as mock_retrieve, \
+         patch('app.services.classifier.nli_score_batch') as mock_nli:
+
+        mock_extract.return_value = ["Claim 1", "Claim 2"]
+        mock_retrieve.side_effect = lambda claims, top_k: [[
+            {"snippet": f"{claim} proof", "source": "https://example.com", "retrieval_score": 0.6}
+        ] for claim in claims]
+        mock_nli.return_value = [0.9, 0.1]
+
+        with ThreadPoolExecutor(max_workers=1) as embed_executor, \
+             ThreadPoolExecutor(max_workers=1) as nli_executor:
+            result = await classify_text_async("Two claims", embed_executor, nli_executor)
+
+        mock_retrieve.assert_called_once_with(["Claim 1", "Claim 2"], top_k=10)
+        mock_nli.assert_called_once_with([("Claim 1", "Claim 1 proof"), ("Claim 2", "Claim 2 proof")])
+        assert [c["classification"] for c in result["claims"]] == ["правда", "неправда"]
+
+
+@pytest.mark.unit
+def test_apply_nli_scores_uses_pair_indices():
+    """Test that NLI scores map back by index even if the gate changes in between."""
+    from app.services.classifier import build_nli_pairs, apply_nli_scores
+
+    proofs_per_claim = [[
+        {"snippet": "Close match", "source": "https://example.com/1", "retrieval_score": 0.7},
+        {"snippet": "Distant match", "source": "https://example.com/2", "retrieval_score": 0.1},
+        {"snippet": "Good match", "source": "https://example.com/3", "retrieval_score": 0.4}
+    ]]
+
+    with patch('app.core.config.settings.nli_gate_threshold', 0.35):
+        pairs, indices = build_nli_pairs(["Test claim"], proofs_per_claim)
+
+    assert pairs == [("Test claim", "Close match"), ("Test claim", "Good match")]
+    assert indices == [(0, 0), (0, 2)]
 
-        with patch.object(ModelManager.get_instance(), 'get_nli', return_value=mock_nli_pipeline):
-            score = nli_score("Einstein was born in 1879.", "Evidence snippet")
+    with patch('app.core.config.settings.nli_gate_threshold', 0.0):
+        result = apply_nli_scores(["Test claim"], proofs_per_claim, indices, [0.8, 0.6])[0]
 
-            # Verify context prefix was added
-            call_args = mock_nli_pipeline.call_args[0][0]
-            assert "Established fact:" in call_args
-            assert score == 0.85
+    assert [p["nli_score"] for p in result["all_proofs"]] == [0.8, 0.0, 0.6]
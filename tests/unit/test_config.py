@@ -13,6 +13,8 @@ def test_default_settings():
     assert settings.use_weighted_aggregation == True
     assert settings.neutral_vote_weight == 0.5
     assert settings.use_nli_context == True
+    assert settings.nli_gate_threshold == 0.35
+    assert settings.faiss_index_type == "flat"  # exact search; HNSW is opt-in for large KBs
 
 
 @pytest.mark.unit
@@ -35,6 +37,7 @@ def test_model_configuration():
     assert settings.embedding_model == "all-MiniLM-L6-v2"
     assert settings.nli_model == "roberta-large-mnli"
     assert settings.device in ["cpu", "cuda"]
+    assert settings.nli_backend in ["torch", "onnx"]
 
 
 @pytest.mark.unit
@@ -53,3 +56,16 @@ def test_paths_configuration():
     assert settings.data_dir.name == "data"
     assert settings.faiss_index_path.name == "wikipedia.index"
     assert settings.kb_snippets_path.name == "kb_snippets.json"
+
+
+@pytest.mark.unit
+def test_torch_num_threads_follows_omp_num_threads(monkeypatch):
+    """Test that an operator-set OMP_NUM_THREADS becomes the torch thread default."""
+    from app.core.config import Settings
+
+    monkeypatch.delenv("TORCH_NUM_THREADS", raising=False)
+    monkeypatch.setenv("OMP_NUM_THREADS", "4")
+    assert Settings().torch_num_threads == 4
+
+    monkeypatch.delenv("OMP_NUM_THREADS")
+    assert Settings().torch_num_threads == 1
@@ -1,7 +1,7 @@
 import pytest
 import numpy as np
 from unittest.mock import Mock, patch
-from app.services.evidence_retriever import retrieve_proofs
+from app.services.evidence_retriever import retrieve_proofs, retrieve_proofs_batch
 from app.core.exceptions import EvidenceRetrievalException
 
 
@@ -207,3 +207,86 @@ def test_retrieve_proofs_maps_indices_to_snippets(mock_model_manager):
 
     # All returned snippets should be from KB
     assert all(snippet in kb_snippet_texts for snippet in returned_snippets)
+
+
+@pytest.mark.unit
+def test_retrieve_proofs_with_hnsw_index(mock_model_manager):
+    """Test retrieval against a real HNSW index and that efSearch covers top_k."""
+    import faiss
+
+    d = 384
+    embeddings = np.random.rand(6, d).astype(np.float32)
+    faiss.normalize_L2(embeddings)
+    index = faiss.IndexHNSWFlat(d, 32, faiss.METRIC_INNER_PRODUCT)
+    index.add(embeddings)
+    index.hnsw.efSearch = 16
+    mock_model_manager._faiss_index = index
+
+    proofs = retrieve_proofs("Albert Einstein was born in 1879.", top_k=6)
+
+    assert len(proofs) == 6
+    assert index.hnsw.efSearch >= 6 * 4
+
+
+@pytest.mark.unit
+def test_retrieve_proofs_normalizes_in_encode(mock_model_manager):
+    """Test that the query embedding is normalized by encode and searched as float32."""
+    claim = "Python is a programming language."
+
+    embed_model = mock_model_manager.get_embed_model()
+    embed_model.encode.return_value = np.random.rand(1, 384).astype(np.float64)
+    faiss_index = mock_model_manager.get_index()
+
+    retrieve_proofs(claim, top_k=3)
+
+    assert embed_model.encode.call_args[1]["normalize_embeddings"] is True
+    query = faiss_index.search.call_args[0][0]
+    assert query.dtype == np.float32
+    assert query.flags["C_CONTIGUOUS"]
+
+
+@pytest.mark.unit
+def test_retrieve_proofs_batch_single_encode_and_search(mock_model_manager):
+    """Test that all claims are encoded and searched in one call each."""
+    claims = ["Einstein was born in 1879.", "Python is a programming language."]
+
+    embed_model = mock_model_manager.get_embed_model()
+    embed_model.encode.return_value = np.random.rand(2, 384).astype(np.float32)
+    faiss_index = mock_model_manager.get_index()
+    faiss_index.search.return_value = (
+        np.array([[0.9, 0.8], [0.7, 0.6]]),
+        np.array([[0, 1], [2, -1]])
+    )
+
+    proofs_per_claim = retrieve_proofs_batch(claims, top_k=2)
+
+    embed_model.encode.assert_called_once()
+    assert embed_model.encode.call_args[0][0] == claims
+    faiss_index.search.assert_called_once()
+    assert faiss_index.search.call_args[0][0].shape == (2, 384)
+
+    kb_snippets = mock_model_manager.get_snippets()
+    assert [p["snippet"] for p in proofs_per_claim[0]] == [kb_snippets[0]["snippet"], kb_snippets[1]["snippet"]]
+    # -1 (no result) is skipped
+    assert [p["snippet"] for p in proofs_per_claim[1]] == [kb_snippets[2]["snippet"]]
+    assert proofs_per_claim[1][0]["retrieval_score"] == pytest.approx(0.7)
+
+
+@pytest.mark.unit
+def test_retrieve_proofs_batch_empty_claims(mock_model_manager):
+    """Test that no claims means no encode or search."""
+    assert retrieve_proofs_batch([]) == []
+    mock_model_manager.get_embed_model().encode.assert_not_called()
+
+
+@pytest.mark.unit
+def test_retrieve_proofs_wraps_search_errors(mock_model_manager):
+    """Test that encoder/FAISS failures surface as EvidenceRetrievalException."""
+    faiss_index = mock_model_manager.get_index()
+    faiss_index.search.side_effect = RuntimeError("search failed")
+
+    with pytest.raises(EvidenceRetrievalException) as exc_info:
+        retrieve_proofs("Python is a programming language.", top_k=3)
+
+    assert exc_info.value.details["error_type"] == "RuntimeError"
+    assert exc_info.value.details["top_k"] == 3
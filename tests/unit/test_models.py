@@ -1,7 +1,7 @@
 import pytest
 from unittest.mock import Mock, patch
 import numpy as np
-from app.core.models import ModelManager
+from app.core.models import ModelManager, KBSnippets
 from app.core.exceptions import ModelNotLoadedException
 
 
@@ -55,6 +55,23 @@ def test_get_nli_without_load_raises_exception():
     ModelManager._instance = None
 
 
+@pytest.mark.unit
+def test_get_nli_tokenizer_without_load_raises_exception():
+    """Test that get_nli_tokenizer raises ModelNotLoadedException when models not loaded."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+
+    with pytest.raises(ModelNotLoadedException) as exc_info:
+        mm.get_nli_tokenizer()
+
+    assert "NLI tokenizer not loaded" in str(exc_info.value)
+
+    # Cleanup
+    ModelManager._instance = None
+
+
 @pytest.mark.unit
 def test_get_index_without_load_raises_exception():
     """Test that get_index raises ModelNotLoadedException when models not loaded."""
@@ -96,12 +113,14 @@ def test_model_manager_with_mocked_models(mock_model_manager):
 
     # Test that we can retrieve models
     embed_model = mock_model_manager.get_embed_model()
-    nli_pipeline = mock_model_manager.get_nli()
+    nli_model = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
     faiss_index = mock_model_manager.get_index()
     kb_snippets = mock_model_manager.get_snippets()
 
     assert embed_model is not None
-    assert nli_pipeline is not None
+    assert nli_model is not None
+    assert nli_tokenizer is not None
     assert faiss_index is not None
     assert kb_snippets is not None
     assert len(kb_snippets) == 6
@@ -120,18 +139,18 @@ def test_embed_model_encode(mock_model_manager):
 
 
 @pytest.mark.unit
-def test_nli_pipeline_output_format(mock_model_manager):
-    """Test that NLI pipeline returns expected output format."""
-    nli_pipeline = mock_model_manager.get_nli()
+def test_nli_model_output_format(mock_model_manager):
+    """Test that NLI model returns one row of 3-way logits per input pair."""
+    nli_model = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
 
-    result = nli_pipeline({"text": "claim", "text_pair": "evidence"})
+    features = nli_tokenizer(["evidence 1", "evidence 2"], ["claim 1", "claim 2"])
+    logits = nli_model(**nli_tokenizer.pad(features)).logits
 
-    assert isinstance(result, list)
-    assert len(result) == 1
-    assert "label" in result[0]
-    assert "score" in result[0]
-    assert result[0]["label"] == "ENTAILMENT"
-    assert 0.0 <= result[0]["score"] <= 1.0
+    assert logits.shape == (2, 3)
+    probs = logits.softmax(dim=-1)
+    assert probs.argmax(dim=-1).tolist() == [2, 2]
+    assert nli_model.config.label2id["ENTAILMENT"] == 2
 
 
 @pytest.mark.unit
@@ -170,8 +189,249 @@ def test_multiple_model_manager_calls_return_same_models(mock_model_manager):
     embed_model1 = mock_model_manager.get_embed_model()
     embed_model2 = mock_model_manager.get_embed_model()
 
-    nli_pipeline1 = mock_model_manager.get_nli()
-    nli_pipeline2 = mock_model_manager.get_nli()
+    nli_model1 = mock_model_manager.get_nli()
+    nli_model2 = mock_model_manager.get_nli()
 
     assert embed_model1 is embed_model2
-    assert nli_pipeline1 is nli_pipeline2
+    assert nli_model1 is nli_model2
+
+
+@pytest.mark.unit
+def test_onnx_backend_without_optimum_raises_exception():
+    """Test that the ONNX backend reports a clear error when optimum is not installed."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+
+    with patch.dict("sys.modules", {"optimum.onnxruntime": None}):
+        with pytest.raises(ModelNotLoadedException) as exc_info:
+            mm._load_onnx_nli()
+
+    assert "optimum" in str(exc_info.value)
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_load_nli_model_uses_onnx_backend():
+    """Test that NLI_BACKEND=onnx loads the ONNX Runtime model and tokenizer."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+    ort_model, tokenizer = Mock(), Mock()
+
+    with patch('app.core.config.settings.nli_backend', "onnx"), \
+         patch.object(mm, '_load_onnx_nli', return_value=(ort_model, tokenizer)), \
+         patch('app.core.models.AutoModelForSequenceClassification') as mock_auto_model:
+        model, tok = mm._load_nli_model()
+
+    assert model is ort_model
+    assert tok is tokenizer
+    mock_auto_model.from_pretrained.assert_not_called()
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_onnx_cache_dir_is_keyed_by_model_name():
+    """Test that each NLI model gets its own exported ONNX directory."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+
+    with patch('app.core.config.settings.nli_model', "roberta-large-mnli"):
+        default_dir = mm._onnx_cache_dir()
+    with patch('app.core.config.settings.nli_model', "facebook/bart-large-mnli"):
+        other_dir = mm._onnx_cache_dir()
+
+    assert default_dir.name == "roberta-large-mnli"
+    assert other_dir.name == "facebook--bart-large-mnli"
+    assert default_dir.parent == other_dir.parent
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_load_embedding_model_quantizes_when_enabled():
+    """Test that EMBEDDING_QUANTIZE=true dynamically quantizes Linear layers to INT8."""
+    import torch
+    from app.core.models import load_embedding_model
+
+    with patch('app.core.config.settings.embedding_quantize', True), \
+         patch('app.core.models.SentenceTransformer') as mock_st, \
+         patch('torch.ao.quantization.quantize_dynamic') as mock_quantize:
+        model = load_embedding_model()
+
+    mock_quantize.assert_called_once_with(mock_st.return_value, {torch.nn.Linear}, dtype=torch.qint8)
+    assert model is mock_quantize.return_value
+
+
+@pytest.mark.unit
+def test_load_embedding_model_fp32_by_default():
+    """Test that the embedding model is not quantized by default."""
+    from app.core.models import load_embedding_model
+
+    with patch('app.core.models.SentenceTransformer') as mock_st, \
+         patch('torch.ao.quantization.quantize_dynamic') as mock_quantize:
+        model = load_embedding_model()
+
+    mock_quantize.assert_not_called()
+    assert model is mock_st.return_value
+
+
+@pytest.mark.unit
+def test_load_nli_model_compiles_when_enabled():
+    """Test that NLI_COMPILE=true returns the torch.compile'd model."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+
+    with patch('app.core.config.settings.nli_compile', True), \
+         patch('app.core.models.AutoTokenizer') as mock_tokenizer_cls, \
+         patch('app.core.models.AutoModelForSequenceClassification'), \
+         patch('torch.compile') as mock_compile:
+        model, _ = mm._load_nli_model()
+
+    mock_compile.assert_called_once()
+    # Warm-up calls trigger compilation at startup
+    assert mock_compile.return_value.call_count == 2
+    # One single-pair batch and one multi-pair batch (size-1 dims get specialized)
+    calls = mock_tokenizer_cls.from_pretrained.return_value.call_args_list
+    assert len(calls) == 2
+    single, multi = (c[0] for c in calls)
+    assert len(single[0]) == len(single[1]) == 1
+    assert len(multi[0]) == len(multi[1]) >= 2
+    assert len(set(multi[0])) > 1
+    assert model is mock_compile.return_value
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_compile_nli_falls_back_to_eager_model():
+    """Test that a failing torch.compile warm-up keeps the eager model."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+    eager_model = Mock()
+
+    with patch('torch.compile') as mock_compile:
+        mock_compile.return_value.side_effect = RuntimeError("no C++ compiler")
+        model = mm._compile_nli(eager_model, Mock())
+
+    assert model is eager_model
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_index_to_gpu_without_gpu_support_keeps_cpu_index():
+    """Test that FAISS_USE_GPU falls back to the CPU index without faiss GPU support."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+    cpu_index = Mock()
+
+    with patch('app.core.models.faiss.get_num_gpus', return_value=0, create=True):
+        index = mm._index_to_gpu(cpu_index)
+
+    assert index is cpu_index
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_index_to_gpu_moves_index():
+    """Test that the index is copied to GPU 0 and the GPU resources are kept alive."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+    cpu_index = Mock()
+
+    with patch('app.core.models.faiss.get_num_gpus', return_value=1, create=True), \
+         patch('app.core.models.faiss.StandardGpuResources', create=True) as mock_res, \
+         patch('app.core.models.faiss.index_cpu_to_gpu', create=True) as mock_to_gpu:
+        index = mm._index_to_gpu(cpu_index)
+
+    mock_to_gpu.assert_called_once_with(mock_res.return_value, 0, cpu_index)
+    assert index is mock_to_gpu.return_value
+    assert mm._faiss_gpu_resources is mock_res.return_value
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_kb_snippets_reads_parquet_columns(tmp_path):
+    """Test that KBSnippets exposes Parquet rows as snippet/source dicts."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "kb_snippets.parquet"
+    pq.write_table(
+        pa.table({
+            "snippet": ["First snippet.", "Second snippet."],
+            "source": ["https://example.com/1", "https://example.com/2"]
+        }),
+        path
+    )
+
+    kb_snippets = KBSnippets.from_parquet(path)
+
+    assert len(kb_snippets) == 2
+    assert kb_snippets[1] == {"snippet": "Second snippet.", "source": "https://example.com/2"}
+    assert kb_snippets[-1] == kb_snippets[1]
+    assert [s["snippet"] for s in kb_snippets] == ["First snippet.", "Second snippet."]
+
+
+@pytest.mark.unit
+def test_load_snippets_falls_back_to_json(tmp_path):
+    """Test that the JSON metadata is used when no Parquet file exists."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    json_path = tmp_path / "kb_snippets.json"
+    json_path.write_text('[{"snippet": "A snippet.", "source": "https://example.com"}]')
+
+    mm = ModelManager.get_instance()
+    with patch('app.core.config.settings.kb_metadata_path', tmp_path / "kb_snippets.parquet"), \
+         patch('app.core.config.settings.kb_snippets_path', json_path):
+        kb_snippets = mm._load_snippets()
+
+    assert kb_snippets == [{"snippet": "A snippet.", "source": "https://example.com"}]
+
+    # Cleanup
+    ModelManager._instance = None
+
+
+@pytest.mark.unit
+def test_read_index_falls_back_without_mmap(tmp_path):
+    """Test that the FAISS index is read normally if the mmap read fails."""
+    # Reset singleton
+    ModelManager._instance = None
+
+    mm = ModelManager.get_instance()
+    index = Mock()
+
+    with patch('app.core.models.faiss.read_index', side_effect=[RuntimeError("mmap"), index]) as mock_read:
+        result = mm._read_index(tmp_path / "wikipedia.index")
+
+    assert result is index
+    assert mock_read.call_count == 2
+    assert mock_read.call_args_list[1].args == (str(tmp_path / "wikipedia.index"),)
+
+    # Cleanup
+    ModelManager._instance = None
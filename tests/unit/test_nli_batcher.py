@@ -0,0 +1,152 @@
+import asyncio
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from app.services.nli_batcher import NLIBatcher
+from app.core.exceptions import NLIVerificationException
+
+
+@pytest.fixture
+def nli_executor():
+    """Single-worker executor, same as the API's nli-worker pool."""
+    executor = ThreadPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def fake_scores(pairs):
+    """Deterministic per-pair score so results can be traced back to their pair."""
+    return [len(claim) / 100 for claim, _ in pairs]
+
+
+@pytest.mark.unit
+async def test_batcher_merges_concurrent_requests(nli_executor):
+    """Test that pairs from concurrent requests are scored in one NLI call."""
+    batcher = NLIBatcher(nli_executor, max_wait=0.05, max_pairs=128)
+    batcher.start()
+
+    pairs_a = [("a" * 10, "Evidence 1"), ("a" * 20, "Evidence 2")]
+    pairs_b = [("b" * 30, "Evidence 3")]
+
+    try:
+        with patch('app.services.nli_batcher.nli_score_batch', side_effect=fake_scores) as mock_nli:
+            scores_a, scores_b = await asyncio.gather(batcher.score(pairs_a), batcher.score(pairs_b))
+    finally:
+        await batcher.stop()
+
+    mock_nli.assert_called_once_with(pairs_a + pairs_b)
+    assert scores_a == [0.1, 0.2]
+    assert scores_b == [0.3]
+
+
+@pytest.mark.unit
+async def test_batcher_respects_max_pairs(nli_executor):
+    """Test that a batch is flushed once max_pairs pairs are pending."""
+    batcher = NLIBatcher(nli_executor, max_wait=0.05, max_pairs=2)
+    batcher.start()
+
+    pairs_a = [("a", "Evidence 1"), ("aa", "Evidence 2")]
+    pairs_b = [("bbb", "Evidence 3"), ("bbbb", "Evidence 4")]
+
+    try:
+        with patch('app.services.nli_batcher.nli_score_batch', side_effect=fake_scores) as mock_nli:
+            scores_a, scores_b = await asyncio.gather(batcher.score(pairs_a), batcher.score(pairs_b))
+    finally:
+        await batcher.stop()
+
+    assert mock_nli.call_count == 2
+    assert scores_a == [0.01, 0.02]
+    assert scores_b == [0.03, 0.04]
+
+
+@pytest.mark.unit
+async def test_batcher_propagates_errors(nli_executor):
+    """Test that an NLI failure is raised in every request it affects."""
+    batcher = NLIBatcher(nli_executor, max_wait=0.05)
+    batcher.start()
+
+    error = NLIVerificationException("NLI verification failed: boom")
+
+    try:
+        with patch('app.services.nli_batcher.nli_score_batch', side_effect=error):
+            results = await asyncio.gather(
+                batcher.score([("Claim 1", "Evidence")]),
+                batcher.score([("Claim 2", "Evidence")]),
+                return_exceptions=True
+            )
+    finally:
+        await batcher.stop()
+
+    assert all(isinstance(r, NLIVerificationException) for r in results)
+
+
+@pytest.mark.unit
+async def test_batcher_isolates_failing_request(nli_executor):
+    """Test that one request's bad input doesn't fail the other requests in its batch."""
+    batcher = NLIBatcher(nli_executor, max_wait=0.05)
+    batcher.start()
+
+    def score_or_fail(pairs):
+        if any(claim == "bad" for claim, _ in pairs):
+            raise NLIVerificationException("NLI verification failed: bad input")
+        return fake_scores(pairs)
+
+    try:
+        with patch('app.services.nli_batcher.nli_score_batch', side_effect=score_or_fail):
+            good, bad = await asyncio.gather(
+                batcher.score([("a" * 10, "Evidence")]),
+                batcher.score([("bad", "Evidence")]),
+                return_exceptions=True
+            )
+    finally:
+        await batcher.stop()
+
+    assert good == [0.1]
+    assert isinstance(bad, NLIVerificationException)
+
+
+@pytest.mark.unit
+async def test_batcher_stop_fails_in_flight_requests(nli_executor):
+    """Test that stop() fails requests whose batch is already running."""
+    import threading
+
+    batcher = NLIBatcher(nli_executor, max_wait=0.0)
+    batcher.start()
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_scores(pairs):
+        started.set()
+        release.wait(timeout=5)
+        return fake_scores(pairs)
+
+    with patch('app.services.nli_batcher.nli_score_batch', side_effect=slow_scores):
+        request = asyncio.ensure_future(batcher.score([("Claim", "Evidence")]))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        await batcher.stop()
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(request, timeout=1)
+
+
+@pytest.mark.unit
+async def test_batcher_empty_pairs(nli_executor):
+    """Test that empty requests return immediately without an NLI call."""
+    batcher = NLIBatcher(nli_executor)
+
+    with patch('app.services.nli_batcher.nli_score_batch') as mock_nli:
+        scores = await batcher.score([])
+
+    assert scores == []
+    mock_nli.assert_not_called()
+
+
+@pytest.mark.unit
+async def test_batcher_not_running_raises(nli_executor):
+    """Test that scoring before start() raises a clear error."""
+    batcher = NLIBatcher(nli_executor)
+
+    assert not batcher.running
+    with pytest.raises(RuntimeError):
+        await batcher.score([("Claim", "Evidence")])
@@ -1,6 +1,8 @@
 import pytest
-from unittest.mock import Mock
-from app.services.nli_verifier import nli_score
+import torch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from app.services.nli_verifier import nli_score, nli_score_batch
 from app.core.exceptions import NLIVerificationException
 
 
@@ -42,22 +44,22 @@ def test_nli_score_with_entailment(mock_model_manager):
 
 @pytest.mark.unit
 def test_nli_score_formats_input_correctly(mock_model_manager):
-    """Test that nli_score formats input with </s></s> separator."""
+    """Test that nli_score passes evidence and claim to the tokenizer as a text pair."""
     claim = "Test claim."
     evidence = "Test evidence."
 
-    nli_pipeline = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
 
     score = nli_score(claim, evidence)
 
-    # Verify NLI pipeline was called
-    nli_pipeline.assert_called_once()
-
-    # Check the input format contains the separator
-    call_args = nli_pipeline.call_args[0][0]
-    assert "</s></s>" in call_args
-    assert evidence in call_args
-    assert claim in call_args
+    # Verify tokenizer was called once with (premises, hypotheses)
+    nli_tokenizer.assert_called_once()
+    premises, hypotheses = nli_tokenizer.call_args[0]
+    assert premises == [evidence]
+    assert len(hypotheses) == 1
+    assert claim in hypotheses[0]
+    # The tokenizer inserts the separator itself
+    assert "</s></s>" not in hypotheses[0]
 
 
 @pytest.mark.unit
@@ -139,49 +141,49 @@ def test_nli_score_calls_model_manager(mock_model_manager):
 
 @pytest.mark.unit
 def test_nli_score_extracts_entailment_label(mock_model_manager):
-    """Test that nli_score correctly extracts ENTAILMENT score from result."""
+    """Test that nli_score correctly extracts the ENTAILMENT probability."""
     claim = "Python is a language."
     evidence = "Python is a programming language."
 
-    # Mock NLI pipeline returns ENTAILMENT with 0.92 score
-    nli_pipeline = mock_model_manager.get_nli()
-    nli_pipeline.return_value = [{"label": "ENTAILMENT", "score": 0.92}]
+    # Mock NLI model predicts ENTAILMENT with 0.92 probability
+    nli_model = mock_model_manager.get_nli()
+    nli_model.probs = [0.03, 0.05, 0.92]
 
     score = nli_score(claim, evidence)
 
-    # Should extract the 0.92 score
-    assert score == 0.92
+    # Should extract the 0.92 probability
+    assert score == pytest.approx(0.92)
 
 
 @pytest.mark.unit
 def test_nli_score_handles_contradiction_label(mock_model_manager):
-    """Test that nli_score returns 0.0 when no entailment label found."""
+    """Test that nli_score returns 0.0 when CONTRADICTION is predicted."""
     claim = "Test claim."
     evidence = "Test evidence."
 
-    # Mock NLI pipeline returns CONTRADICTION
-    nli_pipeline = mock_model_manager.get_nli()
-    nli_pipeline.return_value = [{"label": "CONTRADICTION", "score": 0.95}]
+    # Mock NLI model predicts CONTRADICTION
+    nli_model = mock_model_manager.get_nli()
+    nli_model.probs = [0.95, 0.03, 0.02]
 
     score = nli_score(claim, evidence)
 
-    # Should return 0.0 when no ENTAILMENT label found
+    # Should return 0.0 when ENTAILMENT is not the predicted label
     assert score == 0.0
 
 
 @pytest.mark.unit
 def test_nli_score_handles_neutral_label(mock_model_manager):
-    """Test that nli_score returns 0.0 for NEUTRAL label."""
+    """Test that nli_score returns 0.0 when NEUTRAL is predicted."""
     claim = "Test claim."
     evidence = "Test evidence."
 
-    # Mock NLI pipeline returns NEUTRAL
-    nli_pipeline = mock_model_manager.get_nli()
-    nli_pipeline.return_value = [{"label": "NEUTRAL", "score": 0.88}]
+    # Mock NLI model predicts NEUTRAL
+    nli_model = mock_model_manager.get_nli()
+    nli_model.probs = [0.02, 0.88, 0.10]
 
     score = nli_score(claim, evidence)
 
-    # Should return 0.0 when no ENTAILMENT label found
+    # Should return 0.0 when ENTAILMENT is not the predicted label
     assert score == 0.0
 
 
@@ -191,34 +193,96 @@ def test_nli_score_handles_case_insensitive_label(mock_model_manager):
     claim = "Test claim."
     evidence = "Test evidence."
 
-    # Mock NLI pipeline returns lowercase "entailment"
-    nli_pipeline = mock_model_manager.get_nli()
-    nli_pipeline.return_value = [{"label": "entailment", "score": 0.85}]
+    # Mock NLI model config uses lowercase labels
+    nli_model = mock_model_manager.get_nli()
+    nli_model.config.label2id = {"contradiction": 0, "neutral": 1, "entailment": 2}
+    nli_model.probs = [0.05, 0.10, 0.85]
 
     score = nli_score(claim, evidence)
 
     # Should match case-insensitively and extract score
-    assert score == 0.85
+    assert score == pytest.approx(0.85)
 
 
 @pytest.mark.unit
-def test_nli_score_multiple_labels_picks_entailment(mock_model_manager):
-    """Test that nli_score picks ENTAILMENT when multiple labels present."""
+def test_nli_score_uses_label2id_for_entailment_column(mock_model_manager):
+    """Test that nli_score reads the ENTAILMENT column from the model config."""
     claim = "Test claim."
     evidence = "Test evidence."
 
-    # Mock NLI pipeline returns multiple labels
-    nli_pipeline = mock_model_manager.get_nli()
-    nli_pipeline.return_value = [
-        {"label": "CONTRADICTION", "score": 0.02},
-        {"label": "NEUTRAL", "score": 0.05},
-        {"label": "ENTAILMENT", "score": 0.93}
-    ]
+    # Mock NLI model with ENTAILMENT as the first column
+    nli_model = mock_model_manager.get_nli()
+    nli_model.config.label2id = {"ENTAILMENT": 0, "NEUTRAL": 1, "CONTRADICTION": 2}
+    nli_model.probs = [0.93, 0.05, 0.02]
 
     score = nli_score(claim, evidence)
 
     # Should find and extract ENTAILMENT score
-    assert score == 0.93
+    assert score == pytest.approx(0.93)
+
+
+@pytest.mark.unit
+def test_nli_score_raises_without_entailment_label(mock_model_manager):
+    """Test that a model without an ENTAILMENT label is rejected."""
+    nli_model = mock_model_manager.get_nli()
+    nli_model.config.label2id = {"LABEL_0": 0, "LABEL_1": 1, "LABEL_2": 2}
+
+    with pytest.raises(NLIVerificationException) as exc_info:
+        nli_score("Test claim.", "Test evidence.")
+
+    assert exc_info.value.details["labels"] == ["LABEL_0", "LABEL_1", "LABEL_2"]
+
+
+@pytest.mark.unit
+def test_nli_score_truncates_long_texts_before_tokenizing(mock_model_manager):
+    """Test that long snippets/claims are cut to the configured chars before tokenizing."""
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
+
+    with patch('app.core.config.settings.nli_max_premise_chars', 20), \
+         patch('app.core.config.settings.nli_max_hypothesis_chars', 30):
+        nli_score("word " * 50, "evidence " * 50, use_context=True)
+
+    premises, hypotheses = nli_tokenizer.call_args[0]
+    assert premises[0] == ("evidence " * 50)[:20]
+    assert hypotheses[0] == ("Established fact: " + "word " * 50)[:30]
+    assert nli_tokenizer.call_args[1]["truncation"] is True
+
+
+@pytest.mark.unit
+def test_nli_score_handles_claim_longer_than_max_length(mock_model_manager):
+    """Test that a token-dense claim filling the whole token budget still scores."""
+    from transformers import BatchEncoding
+
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
+
+    def tokenize(premises, hypotheses, truncation=False, max_length=None, **kwargs):
+        # Mimics the fast tokenizer: "only_first" raises when the hypothesis
+        # alone leaves no room for the premise, longest_first never does
+        input_ids = []
+        for p, h in zip(premises, hypotheses):
+            p_len, h_len = len(p.split()), len(h.split())
+            if truncation == "only_first" and h_len + 4 >= max_length:
+                raise ValueError("Sequence to truncate too short to respect the provided max_length")
+            if truncation and max_length:
+                while p_len + h_len + 4 > max_length:
+                    if p_len >= h_len:
+                        p_len -= 1
+                    else:
+                        h_len -= 1
+            input_ids.append([1] * (p_len + h_len + 4))
+        return BatchEncoding({
+            "input_ids": input_ids,
+            "attention_mask": [[1] * len(ids) for ids in input_ids]
+        })
+
+    nli_tokenizer.side_effect = tokenize
+
+    # 500 chars of digits is ~250 tokens, more than max_length allows with a premise
+    score = nli_score("1 " * 300, "Evidence text about numbers.", use_context=True)
+
+    assert 0.0 <= score <= 1.0
+    input_ids = nli_tokenizer.pad.call_args[0][0]["input_ids"]
+    assert len(input_ids[0]) <= 256
 
 
 @pytest.mark.unit
@@ -227,13 +291,158 @@ def test_nli_score_premise_hypothesis_order(mock_model_manager):
     claim = "Claim text."
     evidence = "Evidence text."
 
-    nli_pipeline = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
 
     score = nli_score(claim, evidence)
 
-    # Verify the input format: premise </s></s> hypothesis
-    call_args = nli_pipeline.call_args[0][0]
-    # Evidence (premise) should come before claim (hypothesis)
-    evidence_pos = call_args.find(evidence)
-    claim_pos = call_args.find(claim)
-    assert evidence_pos < claim_pos
+    # Evidence (premise) is the first text, claim (hypothesis) the second
+    premises, hypotheses = nli_tokenizer.call_args[0]
+    assert premises[0] == evidence
+    assert hypotheses[0].endswith(claim)
+
+
+@pytest.mark.unit
+def test_nli_score_batch_single_forward_pass(mock_model_manager):
+    """Test that nli_score_batch scores all pairs with one model call."""
+    pairs = [
+        ("Einstein was born in 1879.", "Albert Einstein was born on March 14, 1879."),
+        ("Python is a language.", "Python is a programming language."),
+        ("Water boils at 100°C.", "Water boils at 100 degrees Celsius.")
+    ]
+
+    nli_model = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
+
+    scores = nli_score_batch(pairs)
+
+    assert len(scores) == 3
+    assert all(score == pytest.approx(0.92) for score in scores)
+    nli_tokenizer.assert_called_once()
+    nli_model.assert_called_once()
+
+
+@pytest.mark.unit
+def test_nli_score_batch_preserves_pair_order(mock_model_manager):
+    """Test that nli_score_batch returns scores in the same order as pairs."""
+    # Long pair first, so length sorting has to reorder the batch
+    pairs = [
+        ("Claim with quite a few more words in it.", "Long evidence text with many words."),
+        ("Claim.", "Evidence.")
+    ]
+
+    # Mock model entails long pairs and contradicts short ones
+    nli_model = mock_model_manager.get_nli()
+
+    def forward(input_ids, attention_mask, **kwargs):
+        lengths = attention_mask.sum(dim=1)
+        probs = [[0.1, 0.1, 0.8] if n > 10 else [0.7, 0.2, 0.1] for n in lengths.tolist()]
+        return SimpleNamespace(logits=torch.log(torch.tensor(probs)))
+
+    nli_model.side_effect = forward
+
+    scores = nli_score_batch(pairs)
+
+    assert scores[0] == pytest.approx(0.8)
+    assert scores[1] == 0.0
+
+
+@pytest.mark.unit
+def test_nli_score_batch_length_bucketing(mock_model_manager):
+    """Test that pairs are sorted by length and split into sub-batches."""
+    pairs = [
+        ("Long claim " * 20, "Long evidence " * 20),
+        ("Short claim.", "Short evidence."),
+        ("Medium claim " * 5, "Medium evidence " * 5),
+        ("Tiny.", "Tiny.")
+    ]
+
+    nli_model = mock_model_manager.get_nli()
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
+
+    with patch('app.core.config.settings.nli_batch_size', 2):
+        scores = nli_score_batch(pairs)
+
+    assert len(scores) == 4
+    assert nli_model.call_count == 2
+
+    # Each sub-batch is padded only to its own longest pair
+    batch_widths = [call.kwargs["input_ids"].shape[1] for call in nli_model.call_args_list]
+    assert batch_widths[0] < batch_widths[1]
+    short_bucket = nli_tokenizer.pad.call_args_list[0][0][0]["input_ids"]
+    assert sorted(len(ids) for ids in short_bucket) == [len(ids) for ids in short_bucket]
+
+
+@pytest.mark.unit
+def test_nli_score_batch_empty_pairs(mock_model_manager):
+    """Test that nli_score_batch returns an empty list without calling the model."""
+    nli_model = mock_model_manager.get_nli()
+
+    scores = nli_score_batch([])
+
+    assert scores == []
+    nli_model.assert_not_called()
+
+
+@pytest.mark.unit
+def test_nli_score_batch_wraps_model_errors(mock_model_manager):
+    """Test that model failures are raised as NLIVerificationException."""
+    nli_model = mock_model_manager.get_nli()
+    nli_model.side_effect = RuntimeError("out of memory")
+
+    with pytest.raises(NLIVerificationException) as exc_info:
+        nli_score_batch([("Claim.", "Evidence.")])
+
+    assert "out of memory" in str(exc_info.value)
+
+
+@pytest.mark.unit
+def test_nli_score_batch_caches_scores(mock_model_manager):
+    """Test that repeated pairs are served from the cache without a model call."""
+    pairs = [("Claim A.", "Evidence A."), ("Claim B.", "Evidence B.")]
+
+    nli_model = mock_model_manager.get_nli()
+
+    first = nli_score_batch(pairs)
+    second = nli_score_batch(pairs)
+
+    assert first == second
+    nli_model.assert_called_once()
+
+
+@pytest.mark.unit
+def test_nli_score_batch_scores_only_uncached_pairs(mock_model_manager):
+    """Test that only new pairs (deduplicated) are sent to the model."""
+    nli_tokenizer = mock_model_manager.get_nli_tokenizer()
+
+    nli_score_batch([("Claim A.", "Evidence A.")])
+    nli_score_batch([("Claim A.", "Evidence A."), ("Claim B.", "Evidence B."), ("Claim B.", "Evidence B.")])
+
+    premises, _ = nli_tokenizer.call_args[0]
+    assert premises == ["Evidence B."]
+
+
+@pytest.mark.unit
+def test_nli_score_batch_cache_disabled(mock_model_manager):
+    """Test that NLI_CACHE_SIZE=0 always runs the model."""
+    pairs = [("Claim A.", "Evidence A.")]
+
+    nli_model = mock_model_manager.get_nli()
+
+    with patch('app.core.config.settings.nli_cache_size', 0):
+        nli_score_batch(pairs)
+        nli_score_batch(pairs)
+
+    assert nli_model.call_count == 2
+
+
+@pytest.mark.unit
+def test_nli_score_batch_cache_respects_context_prefix(mock_model_manager):
+    """Test that scores with and without the context prefix are cached separately."""
+    pairs = [("Claim A.", "Evidence A.")]
+
+    nli_model = mock_model_manager.get_nli()
+
+    nli_score_batch(pairs, use_context=True)
+    nli_score_batch(pairs, use_context=False)
+
+    assert nli_model.call_count == 2
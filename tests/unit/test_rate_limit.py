@@ -0,0 +1,29 @@
+import pytest
+from starlette.requests import Request
+from slowapi.util import get_remote_address
+from app.core.rate_limit import client_ip_key
+
+
+def make_request(client):
+    """Build a bare HTTP request with the given ASGI client tuple."""
+    return Request({"type": "http", "method": "POST", "path": "/api/v1/classify", "headers": [], "client": client})
+
+
+@pytest.mark.unit
+def test_client_ip_key_returns_client_host():
+    """Test that the key is the client IP from the ASGI scope."""
+    assert client_ip_key(make_request(("203.0.113.7", 51234))) == "203.0.113.7"
+
+
+@pytest.mark.unit
+def test_client_ip_key_without_client():
+    """Test the fallback key when the server provides no client address."""
+    assert client_ip_key(make_request(None)) == "127.0.0.1"
+
+
+@pytest.mark.unit
+def test_client_ip_key_matches_slowapi_default():
+    """Test that the key is the same as slowapi's get_remote_address."""
+    for client in [("198.51.100.1", 8000), ("", 0), None]:
+        request = make_request(client)
+        assert client_ip_key(request) == get_remote_address(request)